@@ -10,17 +10,25 @@ This is designed to run in GitHub Actions using WIF/OIDC (no JSON keys).
 from __future__ import annotations
 
 import os
+import calendar
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
-
-from google.cloud import bigquery
-from google.cloud import firestore
-from google.api_core.exceptions import NotFound, PermissionDenied
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from cost_monitoring.alerting.notifiers import send_slack
 from cost_monitoring.utils.anomaly_config import parse_daily_spike_factor
 
+if TYPE_CHECKING:
+    # The Google Cloud clients are imported lazily where they are used: they pull
+    # in gRPC/protobuf, which is wasted start-up time on the skip paths and in tests.
+    from google.cloud import bigquery
+
+
+# Anomaly checks compare yesterday against the 7 days before it.
+ANOMALY_LOOKBACK_DAYS = 8
+
 
 def _utc_now() -> dt.datetime:
     return dt.datetime.now(dt.timezone.utc)
@@ -78,6 +86,9 @@ def load_budget_config(admin_project_id: str) -> Dict[str, Any]:
     # Restrict to a dedicated Firestore DB to avoid broad access to admin Firestore data.
     # Must match infra: `google_firestore_database.ai_usage_settings` (name: ai-usage-settings).
     db_id = _env("AI_USAGE_SETTINGS_FIRESTORE_DATABASE_ID", "ai-usage-settings")
+    from google.api_core.exceptions import NotFound, PermissionDenied
+    from google.cloud import firestore
+
     try:
         db = firestore.Client(project=admin_project_id, database=db_id)
         doc = db.collection("settings").document("ai_usage_telemetry").get()
@@ -97,88 +108,133 @@ def load_budget_config(admin_project_id: str) -> Dict[str, Any]:
     return data
 
 
-def get_mtd_spend(platform_project_id: str, dataset: str) -> List[Dict[str, Any]]:
-    bq = bigquery.Client(project=platform_project_id)
-    table = f"`{platform_project_id}.{dataset}.agg_ai_usage_daily`"
+@lru_cache(maxsize=None)
+def _bq_client(project_id: str) -> bigquery.Client:
+    from google.cloud import bigquery
 
-    query = f"""
-      select
-        provider,
-        product,
-        cast(sum(cost_usd) as float64) as cost_mtd_usd,
-        safe_divide(cast(sum(cost_usd) as float64), extract(day from current_date())) * extract(day from last_day(current_date())) as projected_month_usd
-      from {table}
-      where event_date between date_trunc(current_date(), month) and current_date()
-      group by 1, 2
-      order by cost_mtd_usd desc
-    """
+    return bigquery.Client(project=project_id)
 
-    rows = list(bq.query(query).result())
-    out: List[Dict[str, Any]] = []
-    for r in rows:
-        out.append(
-            {
-                "provider": r.get("provider"),
-                "product": r.get("product"),
-                "cost_mtd_usd": float(r.get("cost_mtd_usd") or 0.0),
-                "projected_month_usd": float(r.get("projected_month_usd") or 0.0),
-            }
-        )
-    return out
 
+def get_usage_spend(
+    platform_project_id: str, dataset: str, days: int = ANOMALY_LOOKBACK_DAYS
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Fetch month-to-date and recent daily spend in a single BigQuery job.
 
-def get_recent_daily_spend(platform_project_id: str, dataset: str, days: int = 14) -> List[Dict[str, Any]]:
-    bq = bigquery.Client(project=platform_project_id)
+    Returns ``(mtd_rows, daily_rows)``; the two grains share one scan of
+    `agg_ai_usage_daily` and are told apart by the `grain` column.
+    """
+    from google.cloud import bigquery
+
+    bq = _bq_client(platform_project_id)
+    # The date scalars are fixed for the job; compute them here (UTC, like BigQuery's
+    # current_date()) and pass them as parameters instead of per-row expressions.
+    today = _utc_now().date()
+    days_in_month = calendar.monthrange(today.year, today.month)[1]
     table = f"`{platform_project_id}.{dataset}.agg_ai_usage_daily`"
 
     query = f"""
+      with recent as (
+        select event_date, provider, product, cost_usd
+        from {table}
+        where event_date >= least(date_trunc(@today, month), date_sub(@today, interval @days day))
+      )
       select
+        'mtd' as grain,
+        cast(null as date) as event_date,
+        provider,
+        product,
+        cast(sum(cost_usd) as float64) as cost_usd,
+        safe_divide(cast(sum(cost_usd) as float64), @dom) * @dim as projected_month_usd
+      from recent
+      where event_date between date_trunc(@today, month) and @today
+      group by provider, product
+      union all
+      select
+        'daily' as grain,
         event_date,
         provider,
-        cast(sum(cost_usd) as float64) as cost_usd
-      from {table}
-      where event_date >= date_sub(current_date(), interval {int(days)} day)
-      group by 1, 2
-      order by 1 asc
+        cast(null as string) as product,
+        cast(sum(cost_usd) as float64) as cost_usd,
+        cast(null as float64) as projected_month_usd
+      from recent
+      where event_date between date_sub(@today, interval @days day) and date_sub(@today, interval 1 day)
+      group by event_date, provider
+      order by grain desc, event_date asc, cost_usd desc
     """
 
-    rows = list(bq.query(query).result())
-    out: List[Dict[str, Any]] = []
-    for r in rows:
-        out.append(
-            {
-                "event_date": r.get("event_date"),
-                "provider": r.get("provider"),
-                "cost_usd": float(r.get("cost_usd") or 0.0),
-            }
-        )
-    return out
+    # Constant query text + parameters keeps repeated runs eligible for the results cache.
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("days", "INT64", int(days)),
+            bigquery.ScalarQueryParameter("today", "DATE", today),
+            bigquery.ScalarQueryParameter("dom", "INT64", today.day),
+            bigquery.ScalarQueryParameter("dim", "INT64", days_in_month),
+        ],
+        use_query_cache=True,
+    )
+    # jobs.query path: a single RPC that returns rows inline for small results.
+    rows = list(bq.query_and_wait(query, job_config=job_config))
+    mtd_rows: List[Dict[str, Any]] = []
+    daily_rows: List[Dict[str, Any]] = []
+    # Positional access follows the select list; cost columns are FLOAT64 (NULL -> 0.0).
+    for grain, event_date, provider, product, cost_usd, projected_month_usd in rows:
+        if grain == "mtd":
+            mtd_rows.append(
+                {
+                    "provider": provider,
+                    "product": product,
+                    "cost_mtd_usd": cost_usd or 0.0,
+                    "projected_month_usd": projected_month_usd or 0.0,
+                }
+            )
+        else:
+            daily_rows.append(
+                {
+                    "event_date": event_date,
+                    "provider": provider,
+                    "cost_usd": cost_usd or 0.0,
+                }
+            )
+    return mtd_rows, daily_rows
 
 
-def _sum_spend(spend_rows: List[Dict[str, Any]], provider: str, product: Optional[str]) -> Tuple[float, float]:
-    used = 0.0
-    projected = 0.0
+SpendTotals = Tuple[float, float]
+
+
+def _index_spend(
+    spend_rows: List[Dict[str, Any]],
+) -> Tuple[Dict[Tuple[str, str], SpendTotals], Dict[str, SpendTotals]]:
+    """Aggregate (used, projected) spend per (provider, product) and per provider in one pass."""
+    by_product: Dict[Tuple[str, str], SpendTotals] = {}
+    by_provider: Dict[str, SpendTotals] = {}
     for row in spend_rows:
-        if (row.get("provider") or "") != provider:
-            continue
-        if product is not None and (row.get("product") or "") != product:
-            continue
-        used += float(row.get("cost_mtd_usd") or 0.0)
-        projected += float(row.get("projected_month_usd") or 0.0)
-    return used, projected
+        provider = row.get("provider") or ""
+        product = row.get("product") or ""
+        used = row["cost_mtd_usd"]
+        projected = row["projected_month_usd"]
+
+        u, p = by_product.get((provider, product), (0.0, 0.0))
+        by_product[(provider, product)] = (u + used, p + projected)
+        u, p = by_provider.get(provider, (0.0, 0.0))
+        by_provider[provider] = (u + used, p + projected)
+    return by_product, by_provider
 
 
 def evaluate_budget_alerts(budgets: List[BudgetItem], spend_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    by_product, by_provider = _index_spend(spend_rows)
     alerts: List[Dict[str, Any]] = []
     for b in budgets:
         if not b.enabled or b.monthly_budget_usd <= 0:
             continue
-        used, projected = _sum_spend(spend_rows, b.provider, b.product)
+        if b.product is not None:
+            used, projected = by_product.get((b.provider, b.product), (0.0, 0.0))
+        else:
+            used, projected = by_provider.get(b.provider, (0.0, 0.0))
         used_pct = used / b.monthly_budget_usd
         projected_pct = projected / b.monthly_budget_usd
 
-        breached = [t for t in b.thresholds if used_pct >= t or projected_pct >= t]
-        if not breached:
+        # Thresholds are sorted ascending (see _parse_budget_item): only the lowest can gate.
+        if not b.thresholds or (used_pct < b.thresholds[0] and projected_pct < b.thresholds[0]):
             continue
 
         alerts.append(
@@ -199,36 +255,47 @@ def evaluate_budget_alerts(budgets: List[BudgetItem], spend_rows: List[Dict[str,
     return alerts
 
 
+def _as_date(value: Any) -> Optional[dt.date]:
+    # BigQuery DATE columns arrive as `datetime.date`; accept ISO strings too.
+    if isinstance(value, dt.datetime):
+        return value.date()
+    if isinstance(value, dt.date):
+        return value
+    try:
+        return dt.date.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
 def evaluate_anomaly_alerts(
     daily_rows: List[Dict[str, Any]],
     *,
     spike_factor: float = 2.0,
     min_usd: float = 10.0,
 ) -> List[Dict[str, Any]]:
-    # Group by provider -> date -> cost
-    by_provider: Dict[str, Dict[str, float]] = {}
+    # Evaluate yesterday vs avg of previous 7 days (excluding yesterday).
+    # Each provider gets a dense array over the lookback window:
+    # index 0 = yesterday, 1..7 = the 7 days before it; days without rows stay 0.0.
+    yesterday_ordinal = _utc_now().date().toordinal() - 1
+    by_provider: Dict[str, List[float]] = {}
     for r in daily_rows:
         provider = str(r.get("provider") or "").strip()
         if not provider:
             continue
-        date_key = str(r.get("event_date"))
-        by_provider.setdefault(provider, {})[date_key] = float(r.get("cost_usd") or 0.0)
-
-    # Evaluate yesterday vs avg of previous 7 days (excluding yesterday)
-    today = _utc_now().date()
-    yesterday = today - dt.timedelta(days=1)
-    prev_start = today - dt.timedelta(days=8)
-    prev_end = today - dt.timedelta(days=2)
+        event_date = _as_date(r.get("event_date"))
+        if event_date is None:
+            continue
+        series = by_provider.get(provider)
+        if series is None:
+            series = by_provider[provider] = [0.0] * ANOMALY_LOOKBACK_DAYS
+        offset = yesterday_ordinal - event_date.toordinal()
+        if 0 <= offset < ANOMALY_LOOKBACK_DAYS:
+            series[offset] = r["cost_usd"]
 
     alerts: List[Dict[str, Any]] = []
     for provider, series in by_provider.items():
-        y_cost = float(series.get(str(yesterday), 0.0))
-        window: List[float] = []
-        d = prev_start
-        while d <= prev_end:
-            window.append(float(series.get(str(d), 0.0)))
-            d += dt.timedelta(days=1)
-        avg_prev = sum(window) / len(window) if window else 0.0
+        y_cost = series[0]
+        avg_prev = sum(series[1:]) / (ANOMALY_LOOKBACK_DAYS - 1)
 
         if y_cost < min_usd or avg_prev <= 0:
             continue
@@ -249,8 +316,29 @@ def evaluate_anomaly_alerts(
     return alerts
 
 
+def _format_alert_line(a: Dict[str, Any]) -> Optional[str]:
+    if a.get("type") == "ai_usage_budget":
+        scope = f"{a.get('provider')}" + (f" / {a.get('product')}" if a.get("product") else "")
+        used_pct = float(a.get("used_pct") or 0.0) * 100
+        proj_pct = float(a.get("projected_pct") or 0.0) * 100
+        return (
+            f"- *{scope}*: MTD ${a.get('mtd_cost_usd', 0):,.2f} / ${a.get('monthly_budget_usd', 0):,.2f} "
+            f"({used_pct:,.1f}%), projected ${a.get('projected_month_usd', 0):,.2f} ({proj_pct:,.1f}%)"
+        )
+    if a.get("type") == "ai_usage_anomaly":
+        return (
+            f"- *{a.get('provider')}*: anomaly spike — yesterday ${a.get('yesterday_cost_usd', 0):,.2f}, "
+            f"prev7 avg ${a.get('avg_prev7_cost_usd', 0):,.2f} (>{a.get('spike_factor', 0)}×)"
+        )
+    return None
+
+
 def format_slack_message(month: str, platform_project_id: str, alerts: List[Dict[str, Any]]) -> Dict[str, Any]:
     header = f"🤖 AI Usage Telemetry Alerts - {month}"
+    lines = [line for line in map(_format_alert_line, alerts[:20]) if line]
+    text = "\n".join(lines) if lines else "No AI usage budget alerts."
+    overflow = len(alerts) - 20
+
     blocks: List[Dict[str, Any]] = [
         {"type": "header", "text": {"type": "plain_text", "text": header, "emoji": True}},
         {
@@ -261,32 +349,14 @@ def format_slack_message(month: str, platform_project_id: str, alerts: List[Dict
             ],
         },
         {"type": "divider"},
+        {"type": "section", "text": {"type": "mrkdwn", "text": text}},
+        *(
+            [{"type": "context", "elements": [{"type": "mrkdwn", "text": f"... and {overflow} more"}]}]
+            if overflow > 0
+            else []
+        ),
     ]
 
-    lines: List[str] = []
-    for a in alerts[:20]:
-        if a.get("type") == "ai_usage_budget":
-            scope = f"{a.get('provider')}" + (f" / {a.get('product')}" if a.get("product") else "")
-            used_pct = float(a.get("used_pct") or 0.0) * 100
-            proj_pct = float(a.get("projected_pct") or 0.0) * 100
-            lines.append(
-                f"- *{scope}*: MTD ${a.get('mtd_cost_usd', 0):,.2f} / ${a.get('monthly_budget_usd', 0):,.2f} "
-                f"({used_pct:,.1f}%), projected ${a.get('projected_month_usd', 0):,.2f} ({proj_pct:,.1f}%)"
-            )
-        elif a.get("type") == "ai_usage_anomaly":
-            lines.append(
-                f"- *{a.get('provider')}*: anomaly spike — yesterday ${a.get('yesterday_cost_usd', 0):,.2f}, "
-                f"prev7 avg ${a.get('avg_prev7_cost_usd', 0):,.2f} (>{a.get('spike_factor', 0)}×)"
-            )
-
-    text = "\n".join(lines) if lines else "No AI usage budget alerts."
-    blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": text}})
-
-    if len(alerts) > 20:
-        blocks.append(
-            {"type": "context", "elements": [{"type": "mrkdwn", "text": f"... and {len(alerts) - 20} more"}]}
-        )
-
     return {"text": f"AI usage alerts ({month}): {len(alerts)}", "blocks": blocks}
 
 
@@ -295,40 +365,47 @@ def main() -> int:
     platform_project_id = _env("AI_USAGE_PLATFORM_PROJECT_ID", "merglbot-platform-prd")
     dataset = _env("AI_USAGE_DATASET", "ai_usage")
 
-    config = load_budget_config(admin_project_id)
-    anomaly_cfg = config.get("anomaly") if isinstance(config.get("anomaly"), dict) else {}
-    spike_factor = parse_daily_spike_factor(anomaly_cfg)
-
-    raw_budgets = config.get("budgets") or []
-    budgets: List[BudgetItem] = []
-    if isinstance(raw_budgets, list):
-        for b in raw_budgets:
-            if isinstance(b, dict):
-                parsed = _parse_budget_item(b)
-                if parsed:
-                    budgets.append(parsed)
-
-    if not budgets:
-        print("AI usage alerts: no budgets configured; skipping.")
-        # Still run anomaly checks even without budgets (best-effort).
-        budgets = []
-
-    spend_rows = get_mtd_spend(platform_project_id, dataset)
-    alerts = evaluate_budget_alerts(budgets, spend_rows) if budgets else []
-
-    daily_rows = get_recent_daily_spend(platform_project_id, dataset, days=14)
-    alerts += evaluate_anomaly_alerts(daily_rows, spike_factor=spike_factor)
-
-    month = _utc_now().strftime("%Y-%m")
-    if alerts:
-        webhook_url = os.environ.get("SLACK_WEBHOOK_URL", "")
-        formatted = format_slack_message(month, platform_project_id, alerts)
-        if webhook_url:
-            send_slack(webhook_url, formatted["text"], formatted["blocks"])
-        else:
-            print("SLACK_WEBHOOK_URL not set; skipping Slack notification.")
-        print(f"AI usage alerts: {len(alerts)} alert(s).")
-        return 2
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="ai-usage") as pool:
+        # The spend query does not depend on the budget config; run it while Firestore is read.
+        spend_future = pool.submit(get_usage_spend, platform_project_id, dataset)
+
+        config = load_budget_config(admin_project_id)
+        anomaly_cfg = config.get("anomaly") if isinstance(config.get("anomaly"), dict) else {}
+        spike_factor = parse_daily_spike_factor(anomaly_cfg)
+
+        raw_budgets = config.get("budgets") or []
+        budgets: List[BudgetItem] = []
+        if isinstance(raw_budgets, list):
+            for b in raw_budgets:
+                if isinstance(b, dict):
+                    parsed = _parse_budget_item(b)
+                    if parsed:
+                        budgets.append(parsed)
+
+        if not budgets:
+            print("AI usage alerts: no budgets configured; skipping.")
+            # Still run anomaly checks even without budgets (best-effort).
+            budgets = []
+
+        spend_rows, daily_rows = spend_future.result()
+        alerts = evaluate_budget_alerts(budgets, spend_rows) if budgets else []
+        alerts += evaluate_anomaly_alerts(daily_rows, spike_factor=spike_factor)
+
+        month = _utc_now().strftime("%Y-%m")
+        if alerts:
+            webhook_url = os.environ.get("SLACK_WEBHOOK_URL", "")
+            formatted = format_slack_message(month, platform_project_id, alerts)
+            slack_future = None
+            if webhook_url:
+                # Post in the background; the exit code still waits for it below.
+                slack_future = pool.submit(send_slack, webhook_url, formatted["text"], formatted["blocks"])
+            else:
+                print("SLACK_WEBHOOK_URL not set; skipping Slack notification.")
+            print(f"AI usage alerts: {len(alerts)} alert(s).")
+            if slack_future is not None:
+                # send_slack bounds its own retries and returns False on failure.
+                slack_future.result()
+            return 2
 
     print("AI usage alerts: OK.")
     return 0
@@ -2,17 +2,49 @@
 Notification handlers for Slack and GitHub Issues.
 """
 
-import os
 import json
-import requests
-from typing import Dict, Any, List, Optional
 import logging
+import os
 from datetime import datetime, timezone
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from ..utils.fast_json import dumps as json_dumps
 from .thresholds import format_alert_message
 
+if TYPE_CHECKING:
+    import requests
+
 logger = logging.getLogger(__name__)
 
+# Shared session: keeps the webhook connection alive between posts and
+# retries transient Slack failures (rate limits, 5xx) with backoff.
+# Read errors are not retried: Slack may already have accepted the message.
+# Built on first use so importing this module does not load `requests`.
+@lru_cache(maxsize=None)
+def _session() -> "requests.Session":
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=3,
+                read=0,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"POST"}),
+                raise_on_status=False,
+            ),
+        ),
+    )
+    return session
+
 
 def send_slack(webhook_url: str, markdown: str, blocks: Optional[List[Dict[str, Any]]] = None) -> bool:
     """Send notification to Slack."""
@@ -25,7 +57,12 @@ def send_slack(webhook_url: str, markdown: str, blocks: Optional[List[Dict[str,
         if blocks:
             payload["blocks"] = blocks
         
-        response = requests.post(webhook_url, json=payload, timeout=15)
+        response = _session().post(
+            webhook_url,
+            data=json_dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=15,
+        )
         
         if response.ok:
             logger.info("Slack notification sent successfully")
@@ -47,126 +84,85 @@ def format_slack_cost_report(
 ) -> Dict[str, Any]:
     """Format cost report for Slack with rich blocks."""
     
-    blocks = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": f"💰 Cost Report - {month}",
-                "emoji": True
-            }
-        }
-    ]
-    
-    # Summary section
     github_total = github_data.get("total_monthly_cost_usd", 0)
     gcp_total = gcp_data.get("total_net_usd", 0)
     grand_total = github_total + gcp_total
     
-    blocks.append({
-        "type": "section",
-        "fields": [
-            {
-                "type": "mrkdwn",
-                "text": f"*Total Monthly Cost:*\n${grand_total:,.2f}"
-            },
-            {
-                "type": "mrkdwn",
-                "text": f"*Alert Count:*\n{len(alerts)} ⚠️"
-            }
-        ]
-    })
-    
-    blocks.append({"type": "divider"})
-    
-    # GitHub section
-    blocks.append({
-        "type": "section",
-        "text": {
-            "type": "mrkdwn",
-            "text": "*GitHub Enterprise Costs*"
-        }
-    })
-    
     copilot = github_data.get("copilot", {})
     ec = github_data.get("enterprise_cloud", {})
     
-    github_fields = [
+    # Top 5 alerts, preceded by a section title, only when there are any
+    alert_blocks = [
+        {"type": "divider"},
+        {"type": "section", "text": {"type": "mrkdwn", "text": "*🚨 Threshold Alerts*"}},
+        *(
+            {"type": "section", "text": {"type": "mrkdwn", "text": format_alert_message(alert)}}
+            for alert in alerts[:5]
+        ),
+    ] if alerts else []
+    
+    blocks = [
         {
-            "type": "mrkdwn",
-            "text": f"*Copilot:*\n${copilot.get('monthly_cost_usd', 0):,.2f} ({copilot.get('seats_assigned', 0)} seats)"
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": f"💰 Cost Report - {month}",
+                "emoji": True
+            }
         },
+        # Summary section
         {
-            "type": "mrkdwn",
-            "text": f"*Enterprise Cloud:*\n${ec.get('monthly_cost_usd', 0):,.2f} ({ec.get('seats', 0)} seats)"
-        }
-    ]
-    
-    blocks.append({
-        "type": "section",
-        "fields": github_fields
-    })
-    
-    blocks.append({"type": "divider"})
-    
-    # GCP section
-    blocks.append({
-        "type": "section",
-        "text": {
-            "type": "mrkdwn",
-            "text": "*GCP Costs*"
-        }
-    })
-    
-    gcp_fields = [
+            "type": "section",
+            "fields": [
+                {"type": "mrkdwn", "text": f"*Total Monthly Cost:*\n${grand_total:,.2f}"},
+                {"type": "mrkdwn", "text": f"*Alert Count:*\n{len(alerts)} ⚠️"}
+            ]
+        },
+        {"type": "divider"},
+        # GitHub section
+        {"type": "section", "text": {"type": "mrkdwn", "text": "*GitHub Enterprise Costs*"}},
         {
-            "type": "mrkdwn",
-            "text": f"*Projects Monitored:*\n{gcp_data.get('projects_monitored', 0)}"
+            "type": "section",
+            "fields": [
+                {
+                    "type": "mrkdwn",
+                    "text": (
+                        f"*Copilot:*\n${copilot.get('monthly_cost_usd', 0):,.2f} "
+                        f"({copilot.get('seats_assigned', 0)} seats)"
+                    )
+                },
+                {
+                    "type": "mrkdwn",
+                    "text": f"*Enterprise Cloud:*\n${ec.get('monthly_cost_usd', 0):,.2f} ({ec.get('seats', 0)} seats)"
+                }
+            ]
         },
+        {"type": "divider"},
+        # GCP section
+        {"type": "section", "text": {"type": "mrkdwn", "text": "*GCP Costs*"}},
         {
-            "type": "mrkdwn",
-            "text": f"*Total Net Cost:*\n${gcp_data.get('total_net_usd', 0):,.2f}"
-        }
-    ]
-    
-    blocks.append({
-        "type": "section",
-        "fields": gcp_fields
-    })
-    
-    # Alerts section if any
-    if alerts:
-        blocks.append({"type": "divider"})
-        blocks.append({
             "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "*🚨 Threshold Alerts*"
-            }
-        })
-        
-        # Show top 5 alerts
-        for alert in alerts[:5]:
-            alert_text = format_alert_message(alert)
-            blocks.append({
-                "type": "section",
-                "text": {
+            "fields": [
+                {"type": "mrkdwn", "text": f"*Projects Monitored:*\n{gcp_data.get('projects_monitored', 0)}"},
+                {"type": "mrkdwn", "text": f"*Total Net Cost:*\n${gcp_data.get('total_net_usd', 0):,.2f}"}
+            ]
+        },
+        *alert_blocks,
+        # Footer
+        {"type": "divider"},
+        {
+            "type": "context",
+            "elements": [
+                {
                     "type": "mrkdwn",
-                    "text": alert_text
+                    "text": (
+                        f"Generated at {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')} "
+                        "| View full report in GitHub Actions"
+                    )
                 }
-            })
-    
-    # Footer
-    blocks.append({"type": "divider"})
-    blocks.append({
-        "type": "context",
-        "elements": [
-            {
-                "type": "mrkdwn",
-                "text": f"Generated at {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')} | View full report in GitHub Actions"
-            }
-        ]
-    })
+            ]
+        }
+    ]
     
     text = f"Cost Report {month}: Total ${grand_total:,.2f} with {len(alerts)} alerts"
     
@@ -7,6 +7,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Alert severities, most severe first
+SEVERITIES = ("critical", "high", "medium", "low")
+
 
 def evaluate_github_thresholds(
     github_data: Dict[str, Any],
@@ -88,13 +91,9 @@ def evaluate_gcp_thresholds(
     for project_cost in project_costs:
         project_id = project_cost["project_id"]
         total_cost = project_cost["total_net_usd"]
-        services = project_cost["services"]
         
         # Get project-specific thresholds or use defaults
-        if project_id in project_thresholds:
-            project_specific = project_thresholds[project_id]
-        else:
-            project_specific = defaults
+        project_specific = project_thresholds.get(project_id, defaults)
         
         # Check total monthly cost
         total_threshold = project_specific.get("total_monthly_usd", 0)
@@ -110,28 +109,43 @@ def evaluate_gcp_thresholds(
         
         # Check per-service costs
         service_thresholds = project_specific.get("per_service_monthly_usd", {})
+        if not service_thresholds:
+            continue
         
-        for service_cost in services:
+        for service_cost in project_cost["services"]:
             service_name = service_cost["service"]
-            service_cost_value = service_cost["net_cost_usd"]
+            service_threshold = service_thresholds.get(service_name)
+            if service_threshold is None:
+                continue
             
-            if service_name in service_thresholds:
-                service_threshold = service_thresholds[service_name]
-                
-                if service_cost_value > service_threshold:
-                    alerts.append({
-                        "scope": "gcp",
-                        "project": project_id,
-                        "type": "service",
-                        "service": service_name,
-                        "value": service_cost_value,
-                        "threshold": service_threshold,
-                        "severity": "medium"
-                    })
+            service_cost_value = service_cost["net_cost_usd"]
+            if service_cost_value > service_threshold:
+                alerts.append({
+                    "scope": "gcp",
+                    "project": project_id,
+                    "type": "service",
+                    "service": service_name,
+                    "value": service_cost_value,
+                    "threshold": service_threshold,
+                    "severity": "medium"
+                })
     
     return alerts
 
 
+def group_alerts_by_severity(alerts: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Bucket alerts by severity in one pass, keeping their order within each bucket.
+
+    Every key of ``SEVERITIES`` is present; alerts with a missing or unknown
+    severity go to ``"low"``.
+    """
+    buckets: Dict[str, List[Dict[str, Any]]] = {severity: [] for severity in SEVERITIES}
+    low = buckets["low"]
+    for alert in alerts:
+        buckets.get(alert.get("severity", "low"), low).append(alert)
+    return buckets
+
+
 def evaluate_all_thresholds(
     github_data: Dict[str, Any],
     gcp_data: Dict[str, Any],
@@ -152,16 +166,11 @@ def evaluate_all_thresholds(
     else:
         logger.warning("No GCP data provided for threshold evaluation")
     
-    all_alerts = github_alerts + gcp_alerts
-    
-    # Ensure all alerts have a severity
-    for alert in all_alerts:
-        if "severity" not in alert:
-            alert["severity"] = "low"
-    
-    # Sort by severity
-    severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-    all_alerts.sort(key=lambda x: severity_order.get(x.get("severity"), 3))
+    # Order alerts by severity and make sure each one carries a severity
+    buckets = group_alerts_by_severity(github_alerts + gcp_alerts)
+    for alert in buckets["low"]:
+        alert.setdefault("severity", "low")
+    all_alerts = [alert for severity in SEVERITIES for alert in buckets[severity]]
     
     threshold_exceeded = len(all_alerts) > 0
     
@@ -172,9 +181,9 @@ def evaluate_all_thresholds(
         "threshold_exceeded": threshold_exceeded,
         "github_alerts_count": len(github_alerts),
         "gcp_alerts_count": len(gcp_alerts),
-        "critical_count": sum(1 for a in all_alerts if a.get("severity") == "critical"),
-        "high_count": sum(1 for a in all_alerts if a.get("severity") == "high"),
-        "medium_count": sum(1 for a in all_alerts if a.get("severity") == "medium")
+        "critical_count": len(buckets["critical"]),
+        "high_count": len(buckets["high"]),
+        "medium_count": len(buckets["medium"])
     }
 
 
@@ -4,24 +4,28 @@ Cost Monitoring CLI - Main entry point.
 
 import os
 import sys
+import copy
 import json
+import functools
 import pathlib
-import datetime as dt
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
 import click
 from rich.console import Console
-from rich.table import Table
+from rich.table import Column, Table
 from rich.panel import Panel
+from rich.syntax import Syntax
 import yaml
 import logging
-from github import Github
 
-# Import all local modules at module level
-from .monitor.github_monitor import collect_github
-from .monitor.gcp_monitor import collect_gcp
+# The collectors (PyGithub, google-cloud-bigquery) are imported inside `generate`
+# so `--help`, `validate-thresholds` and `print-config` don't pay for them.
 from .alerting.thresholds import evaluate_all_thresholds, format_alert_message
 from .alerting.notifiers import send_cost_report_to_slack
 from .report.writers import write_all_reports
+from .utils import cache
+from .utils.dates import current_month_utc
+from .utils.fast_json import dumps as json_dumps
 
 # Configure logging
 logging.basicConfig(
@@ -30,15 +34,55 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Prefer the libyaml-backed loader when PyYAML was built with it.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader as _YamlLoader
+
 console = Console()
 
 
+# Zero-valued data used in place of a collector's result when it fails
+_GITHUB_FALLBACK: Dict[str, Any] = {
+    "total_monthly_cost_usd": 0,
+    "copilot": {"seats_assigned": 0, "monthly_cost_usd": 0},
+    "enterprise_cloud": {"seats": 0, "monthly_cost_usd": 0},
+    "total_members": 0,
+    "org_members": []
+}
+_GCP_FALLBACK: Dict[str, Any] = {
+    "total_net_usd": 0,
+    "project_costs": []
+}
+
+
+Collector = Callable[..., Dict[str, Any]]
+
+
+def safe_collect(name: str, default: Dict[str, Any]) -> Callable[[Collector], Collector]:
+    """Wrap a collector so a failure yields ``{"error": ..., **default}`` instead of raising."""
+    def decorator(fn: Collector) -> Collector:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Failed to collect {name} data: {e}")
+                return {"error": str(e), **copy.deepcopy(default)}
+        return wrapper
+    return decorator
+
+
 @click.group()
 @click.option('--debug', is_flag=True, help='Enable debug logging')
-def cli(debug):
+@click.option('--no-cache', is_flag=True, help='Bypass the on-disk GitHub API response cache')
+def cli(debug, no_cache):
     """Cost Monitoring Tool for Merglbot Enterprise."""
     if debug:
         logging.getLogger().setLevel(logging.DEBUG)
+    if no_cache:
+        cache.set_enabled(False)
 
 
 @cli.command()
@@ -62,51 +106,45 @@ def generate(month, config, thresholds, outdir, formats, dry_run, soft_fail):
         
         # 2. Determine month
         if not month:
-            month = dt.datetime.now().strftime("%Y-%m")
+            month = current_month_utc()
         console.print(f"📅 Monitoring period: [bold green]{month}[/bold green]")
         
-        # 3. Collect GitHub data
-        console.print("\n[bold]Collecting GitHub data...[/bold]")
-        try:
-            github_data = collect_github(
-                config_data["github"]["enterprise"],
-                config_data["github"]["orgs"],
-                config_data["github"]["pricing"]
+        from .monitor.gcp_monitor import collect_gcp
+        from .monitor.github_monitor import collect_github
+        
+        # 3./4. GitHub API and BigQuery are independent; collect both concurrently
+        collectors = ThreadPoolExecutor(max_workers=2, thread_name_prefix="collect")
+        github_future = collectors.submit(
+            safe_collect("GitHub", _GITHUB_FALLBACK)(
+                lambda: collect_github(
+                    config_data["github"]["enterprise"],
+                    config_data["github"]["orgs"],
+                    config_data["github"]["pricing"]
+                )
             )
+        )
+        gcp_future = collectors.submit(
+            safe_collect("GCP", _GCP_FALLBACK)(lambda: collect_gcp(config_data["gcp"], month))
+        )
+        collectors.shutdown(wait=False)
+        
+        # 3. GitHub data
+        console.print("\n[bold]Collecting GitHub data...[/bold]")
+        github_data = github_future.result()
+        if "error" in github_data:
+            console.print(f"[red]❌ GitHub collection failed: {github_data['error']}[/red]")
+        else:
             console.print("✅ GitHub data collected successfully")
-            
-            # Display GitHub summary
             display_github_summary(github_data)
-            
-        except Exception as e:
-            logger.error(f"Failed to collect GitHub data: {e}")
-            github_data = {
-                "error": str(e),
-                "total_monthly_cost_usd": 0,
-                "copilot": {"seats_assigned": 0, "monthly_cost_usd": 0},
-                "enterprise_cloud": {"seats": 0, "monthly_cost_usd": 0},
-                "total_members": 0,
-                "org_members": []
-            }
-            console.print(f"[red]❌ GitHub collection failed: {e}[/red]")
-        
-        # 4. Collect GCP data
+        
+        # 4. GCP data
         console.print("\n[bold]Collecting GCP data...[/bold]")
-        try:
-            gcp_data = collect_gcp(config_data["gcp"], month)
+        gcp_data = gcp_future.result()
+        if "error" in gcp_data:
+            console.print(f"[red]❌ GCP collection failed: {gcp_data['error']}[/red]")
+        else:
             console.print("✅ GCP data collected successfully")
-            
-            # Display GCP summary
             display_gcp_summary(gcp_data)
-            
-        except Exception as e:
-            logger.error(f"Failed to collect GCP data: {e}")
-            gcp_data = {
-                "error": str(e),
-                "total_net_usd": 0,
-                "project_costs": []
-            }
-            console.print(f"[red]❌ GCP collection failed: {e}[/red]")
         
         # 5. Evaluate thresholds
         console.print("\n[bold]Evaluating thresholds...[/bold]")
@@ -130,7 +168,7 @@ def generate(month, config, thresholds, outdir, formats, dry_run, soft_fail):
         }
         
         # Write reports
-        report_paths = write_all_reports(outdir, combined_data, month)
+        report_paths = write_all_reports(outdir, combined_data, month, formats=formats.split(","))
         
         console.print("[green]✅ Reports generated:[/green]")
         for format_name, path in report_paths.items():
@@ -222,7 +260,9 @@ def print_config(config):
                 data["gcp"]["billing_account_id"] = "****-****-****"
         
         console.print(Panel.fit("[bold]Effective Configuration[/bold]"))
-        console.print_json(data=data)
+        # Serialize once with the fast encoder and only highlight the result; soft_wrap
+        # keeps long values on one line so piped output stays valid JSON
+        console.print(Syntax(json_dumps(data, indent=True).decode("utf-8"), "json", theme="ansi_dark"), soft_wrap=True)
         
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -236,14 +276,38 @@ def load_config(path: str) -> Dict[str, Any]:
         raise FileNotFoundError(f"Configuration file not found: {path}")
     
     with open(config_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+# Value formatters for alert rows, keyed by the kind of metric the alert type measures
+_ALERT_VALUE_FORMATS = {"usd": "${:,.2f}".format, "count": str}
+
+
+def _make_metric_table(title: str) -> Table:
+    """Two-column Metric/Value table used by the summary views."""
+    return Table(
+        Column("Metric", style="cyan"),
+        Column("Value", justify="right", style="green"),
+        title=title,
+        show_header=True,
+    )
+
+
+def _make_alerts_table() -> Table:
+    return Table(
+        Column("Severity", style="yellow"),
+        Column("Scope", style="cyan"),
+        Column("Item", style="white"),
+        Column("Value", justify="right", style="red"),
+        Column("Threshold", justify="right", style="green"),
+        title="Threshold Alerts",
+        show_header=True,
+    )
 
 
 def display_github_summary(data: Dict[str, Any]):
     """Display GitHub cost summary table."""
-    table = Table(title="GitHub Costs", show_header=True)
-    table.add_column("Metric", style="cyan")
-    table.add_column("Value", justify="right", style="green")
+    table = _make_metric_table("GitHub Costs")
     
     copilot = data.get("copilot", {})
     ec = data.get("enterprise_cloud", {})
@@ -260,9 +324,7 @@ def display_github_summary(data: Dict[str, Any]):
 
 def display_gcp_summary(data: Dict[str, Any]):
     """Display GCP cost summary table."""
-    table = Table(title="GCP Costs", show_header=True)
-    table.add_column("Metric", style="cyan")
-    table.add_column("Value", justify="right", style="green")
+    table = _make_metric_table("GCP Costs")
     
     table.add_row("Projects Monitored", str(data.get("projects_monitored", 0)))
     table.add_row("Total Cost", f"${data.get('total_cost_usd', 0):,.2f}")
@@ -277,12 +339,7 @@ def display_alerts(alerts: list):
     if not alerts:
         return
     
-    table = Table(title="Threshold Alerts", show_header=True)
-    table.add_column("Severity", style="yellow")
-    table.add_column("Scope", style="cyan")
-    table.add_column("Item", style="white")
-    table.add_column("Value", justify="right", style="red")
-    table.add_column("Threshold", justify="right", style="green")
+    table = _make_alerts_table()
     
     for alert in alerts[:10]:  # Show top 10
         severity = alert.get("severity", "medium")
@@ -293,17 +350,15 @@ def display_alerts(alerts: list):
         else:  # gcp
             item = f"{alert.get('project', '')} - {alert.get('service', alert.get('type', ''))}"
         
-        value = alert.get("value", 0)
-        threshold = alert.get("threshold", 0)
+        fmt = _ALERT_VALUE_FORMATS["usd" if "usd" in alert.get("type", "") else "count"]
         
-        if "usd" in alert.get("type", ""):
-            value_str = f"${value:,.2f}"
-            threshold_str = f"${threshold:,.2f}"
-        else:
-            value_str = str(value)
-            threshold_str = str(threshold)
-        
-        table.add_row(severity.upper(), scope.upper(), item, value_str, threshold_str)
+        table.add_row(
+            severity.upper(),
+            scope.upper(),
+            item,
+            fmt(alert.get("value", 0)),
+            fmt(alert.get("threshold", 0)),
+        )
     
     console.print(table)
     
@@ -353,6 +408,8 @@ def create_github_issue_for_alerts(alerts: list, month: str, data: Dict[str, Any
             logger.error("Invalid repository name format for GITHUB_REPOSITORY environment variable")
             return False
         
+        from github import Github
+        
         g = Github(token)
         repo = g.get_repo(repo_name)
         
@@ -2,15 +2,28 @@
 GCP billing and cost monitoring via BigQuery export.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from google.cloud import bigquery
 from google.cloud.billing.budgets_v1 import BudgetServiceClient
 import logging
-from datetime import datetime
+from functools import lru_cache
+
+from ..utils.dates import current_month_utc
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4)
+def _bq_client(project_id: str) -> bigquery.Client:
+    """BigQuery client per project; credential discovery happens once per process."""
+    return bigquery.Client(project=project_id)
+
+
+@lru_cache(maxsize=1)
+def _budget_client() -> BudgetServiceClient:
+    return BudgetServiceClient()
+
+
 def query_month_costs_by_service(
     bq: bigquery.Client,
     table_fqn: str,
@@ -20,8 +33,7 @@ def query_month_costs_by_service(
     """Query current month costs grouped by project and service."""
     
     # Build query with parameterized project IDs and month
-    from datetime import timezone
-    month_start = f"{month}-01" if month else datetime.now(timezone.utc).strftime("%Y-%m-01")
+    month_start = f"{month or current_month_utc()}-01"
 
     # Validate table name format to prevent SQL injection
     try:
@@ -43,8 +55,8 @@ def query_month_costs_by_service(
     SELECT 
         project.id AS project_id, 
         service.description AS service, 
-        SUM(cost) AS cost_usd,
-        SUM(IFNULL((SELECT SUM(c.amount) FROM UNNEST(credits) c), 0)) AS credits_usd
+        IFNULL(SUM(cost), 0.0) AS cost_usd,
+        IFNULL(SUM((SELECT SUM(c.amount) FROM UNNEST(credits) c)), 0.0) AS credits_usd
     FROM `{table_fqn}`
     WHERE usage_start_time >= TIMESTAMP_TRUNC(TIMESTAMP(@month_start), MONTH)
       AND usage_start_time < TIMESTAMP_ADD(TIMESTAMP_TRUNC(TIMESTAMP(@month_start), MONTH), INTERVAL 1 MONTH)
@@ -55,44 +67,37 @@ def query_month_costs_by_service(
     
     try:
         logger.info(f"Querying BigQuery for {len(project_ids)} projects")
-        query_job = bq.query(sql, job_config=job_config)
-        rows = query_job.result()
+        # jobs.query path: one RPC, rows come back inline instead of via a separate page fetch
+        rows = bq.query_and_wait(sql, job_config=job_config)
         
-        # Group by project
-        grouped: Dict[str, List[Dict[str, float]]] = {}
+        # Group by project, accumulating each project's totals as its rows arrive
+        grouped: Dict[str, Dict[str, Any]] = {}
         
-        for row in rows:
-            project_id = row.project_id
-            service = row.service
-            cost = float(row.cost_usd) if row.cost_usd else 0.0
-            credits = float(row.credits_usd) if row.credits_usd else 0.0
+        # Positional unpacking follows the SELECT list and skips per-field name lookups;
+        # both amounts are FLOAT64 and already coalesced to 0.0 by the query
+        for project_id, service, cost, credits in rows:
             net_cost = cost - credits
             
-            if project_id not in grouped:
-                grouped[project_id] = []
-            
-            grouped[project_id].append({
+            project = grouped.get(project_id)
+            if project is None:
+                project = grouped[project_id] = {
+                    "project_id": project_id,
+                    "services": [],
+                    "total_cost_usd": 0.0,
+                    "total_credits_usd": 0.0,
+                    "total_net_usd": 0.0
+                }
+            project["services"].append({
                 "service": service,
                 "cost_usd": cost,
                 "credits_usd": credits,
                 "net_cost_usd": net_cost
             })
+            project["total_cost_usd"] += cost
+            project["total_credits_usd"] += credits
+            project["total_net_usd"] += net_cost
         
-        # Format results
-        results = []
-        for project_id, services in grouped.items():
-            total_cost = sum(s["cost_usd"] for s in services)
-            total_credits = sum(s["credits_usd"] for s in services)
-            total_net = sum(s["net_cost_usd"] for s in services)
-            
-            results.append({
-                "project_id": project_id,
-                "services": services,
-                "total_cost_usd": total_cost,
-                "total_credits_usd": total_credits,
-                "total_net_usd": total_net
-            })
-        
+        results = list(grouped.values())
         logger.info(f"Retrieved costs for {len(results)} projects")
         return results
         
@@ -104,7 +109,7 @@ def query_month_costs_by_service(
 def list_budgets(billing_account_id: str) -> List[Dict[str, Any]]:
     """List budgets for the billing account."""
     try:
-        client = BudgetServiceClient()
+        client = _budget_client()
         parent = f"billingAccounts/{billing_account_id}"
         
         budgets = []
@@ -143,6 +148,39 @@ def _get_all_projects_recursively(config_node: Any) -> List[str]:
             projects.extend(_get_all_projects_recursively(value))
     return projects
 
+
+# (category, subcategory or None for a flat category, unique project IDs)
+ProjectGroup = Tuple[str, Optional[str], List[str]]
+
+
+def _index_projects_config(projects_config: Any) -> Tuple[List[str], List[ProjectGroup]]:
+    """Walk the projects config once, returning all unique project IDs and the category groups.
+
+    Flat categories (``category: [ids]``) and one level of subcategories
+    (``category: {sub: [ids]}``) become groups; deeper nesting is still
+    monitored but not broken out in ``categorized_costs``.
+    """
+    if not isinstance(projects_config, dict):
+        return list(dict.fromkeys(_get_all_projects_recursively(projects_config))), []
+    
+    all_projects: Dict[str, None] = {}
+    groups: List[ProjectGroup] = []
+    for category, category_data in projects_config.items():
+        if isinstance(category_data, list):
+            ids = list(dict.fromkeys(p for p in category_data if isinstance(p, str)))
+            groups.append((category, None, ids))
+            all_projects.update(dict.fromkeys(ids))
+        elif isinstance(category_data, dict):
+            for subcategory, project_list in category_data.items():
+                if isinstance(project_list, list):
+                    ids = list(dict.fromkeys(p for p in project_list if isinstance(p, str)))
+                    groups.append((category, subcategory, ids))
+                    all_projects.update(dict.fromkeys(ids))
+                else:
+                    all_projects.update(dict.fromkeys(_get_all_projects_recursively(project_list)))
+    return list(all_projects), groups
+
+
 def collect_gcp(
     config: Dict[str, Any],
     month: Optional[str] = None
@@ -156,9 +194,10 @@ def collect_gcp(
     table_pattern = billing_config.get("table_pattern", "gcp_billing_export_v1_*")
     billing_account_id = config.get("billing_account_id")
     
-    # Get all project IDs using recursive helper
+    # Get all project IDs and category groups in one pass over the config;
+    # a project listed under several categories is still queried (and counted) once
     projects_config = config.get("projects", {})
-    all_projects = _get_all_projects_recursively(projects_config)
+    all_projects, project_groups = _index_projects_config(projects_config)
     
     if not all_projects:
         logger.warning("No projects configured for GCP monitoring")
@@ -166,13 +205,13 @@ def collect_gcp(
     
     # Initialize BigQuery client
     try:
-        bq_client = bigquery.Client(project=project_id)
+        bq_client = _bq_client(project_id)
         
         # Determine current month or use specified
         if month:
             current_month = month
         else:
-            current_month = datetime.now().strftime("%Y-%m")
+            current_month = current_month_utc()
         
         # Build table reference (use wildcard pattern)
         table_fqn = f"{project_id}.{dataset}.{table_pattern}"
@@ -185,35 +224,38 @@ def collect_gcp(
         if billing_account_id and billing_account_id != "XXXX-XXXX-XXXX":
             budgets = list_budgets(billing_account_id)
         
-        # Calculate totals
-        total_cost = sum(p["total_cost_usd"] for p in project_costs)
-        total_credits = sum(p["total_credits_usd"] for p in project_costs)
-        total_net = sum(p["total_net_usd"] for p in project_costs)
+        # Calculate totals (single pass)
+        total_cost = total_credits = total_net = 0.0
+        for p in project_costs:
+            total_cost += p["total_cost_usd"]
+            total_credits += p["total_credits_usd"]
+            total_net += p["total_net_usd"]
         
-        # Group by category for reporting
-        categorized_costs = {}
-        for category, category_data in projects_config.items():
-            categorized_costs[category] = {}
-            
-            if isinstance(category_data, list):
+        # Group by category for reporting (index once; categories only look projects up)
+        by_id = {p["project_id"]: p for p in project_costs}
+        categorized_costs: Dict[str, Dict[str, Any]] = (
+            {category: {} for category in projects_config} if isinstance(projects_config, dict) else {}
+        )
+        for category, subcategory, ids in project_groups:
+            group_costs = []
+            group_cost = group_net = 0.0
+            for pid in ids:
+                p = by_id.get(pid)
+                if p is not None:
+                    group_costs.append(p)
+                    group_cost += p["total_cost_usd"]
+                    group_net += p["total_net_usd"]
+            entry = {
+                "projects": group_costs,
+                "total_cost_usd": group_cost,
+                "total_net_usd": group_net
+            }
+            if subcategory is None:
                 # Direct list of projects
-                category_projects = category_data
-                category_project_costs = [p for p in project_costs if p["project_id"] in category_projects]
-                categorized_costs[category] = {
-                    "projects": category_project_costs,
-                    "total_cost_usd": sum(p["total_cost_usd"] for p in category_project_costs),
-                    "total_net_usd": sum(p["total_net_usd"] for p in category_project_costs)
-                }
-            elif isinstance(category_data, dict):
+                categorized_costs[category] = entry
+            else:
                 # Nested structure (e.g., clients)
-                for subcategory, project_list in category_data.items():
-                    if isinstance(project_list, list):
-                        sub_project_costs = [p for p in project_costs if p["project_id"] in project_list]
-                        categorized_costs[category][subcategory] = {
-                            "projects": sub_project_costs,
-                            "total_cost_usd": sum(p["total_cost_usd"] for p in sub_project_costs),
-                            "total_net_usd": sum(p["total_net_usd"] for p in sub_project_costs)
-                        }
+                categorized_costs[category][subcategory] = entry
         
         return {
             "month": current_month,
@@ -6,14 +6,33 @@ import os
 import time
 import math
 import requests
-from typing import Dict, Any, List, Tuple, Optional
-from github import Github
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, List, Tuple, Optional
 import logging
 
+from ..utils import cache
+from ..utils.cache import ttl_cached
+
+if TYPE_CHECKING:
+    from github import Github
+
 logger = logging.getLogger(__name__)
 
 API = "https://api.github.com"
 
+# Cache lifetimes (seconds): billing moves slowly, membership a bit faster.
+COPILOT_CACHE_TTL = 3600
+MEMBERS_CACHE_TTL = 900
+# ETags outlive the response cache: once the TTL lapses, a conditional request
+# answered with 304 (no body, no rate-limit charge) revalidates the stored body.
+ETAG_CACHE_TTL = 7 * 24 * 3600
+
+# Upper bound on concurrent GitHub API calls while collecting.
+MAX_WORKERS = 8
+
 
 def _headers() -> Dict[str, str]:
     """Get headers with GitHub token for API calls."""
@@ -27,7 +46,50 @@ def _headers() -> Dict[str, str]:
     }
 
 
-def list_org_members_count(gh: Github, org: str) -> int:
+def _get_json_conditional(endpoint: str, arg: str, url: str) -> Tuple[int, Dict[str, Any]]:
+    """GET ``url`` with ``If-None-Match`` from the last response; a 304 returns the stored body.
+
+    Returns ``(status_code, body)``; the body is ``{}`` for error responses.
+    """
+    headers = _headers()
+    stored = cache.get(f"{endpoint}:etag", arg)
+    if stored:
+        headers["If-None-Match"] = stored["etag"]
+    r = _session().get(url, headers=headers, timeout=(5, 30))
+    if r.status_code == 304 and stored:
+        return 200, stored["body"]
+    if not r.ok:
+        return r.status_code, {}
+    body = r.json()
+    etag = r.headers.get("ETag")
+    if etag and body:
+        cache.put(f"{endpoint}:etag", arg, {"etag": etag, "body": body}, ETAG_CACHE_TTL)
+    return r.status_code, body
+
+
+@lru_cache(maxsize=None)
+def _session() -> requests.Session:
+    """Shared session: reuses TLS connections to api.github.com and retries rate limits/5xx."""
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=MAX_WORKERS,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            ),
+        ),
+    )
+    return session
+
+
+@ttl_cached("org_members_count", MEMBERS_CACHE_TTL)
+def list_org_members_count(gh: "Github", org: str) -> int:
     """Get member count for an organization without logging PII."""
     try:
         members = gh.get_organization(org).get_members()
@@ -39,40 +101,86 @@ def list_org_members_count(gh: Github, org: str) -> int:
         return 0
 
 
+def list_org_members_counts(orgs: List[str]) -> Dict[str, int]:
+    """Get member counts for many organizations in one GraphQL request.
+
+    Orgs are aliased ``o0``, ``o1``, ... in a single query. Orgs that could not be
+    resolved are left out of the result so callers can fall back to REST.
+    """
+    counts: Dict[str, int] = {}
+    pending: List[str] = []
+    for org in dict.fromkeys(orgs):
+        cached = cache.get("org_members_count", org)
+        if cached is not None:
+            counts[org] = cached
+        else:
+            pending.append(org)
+    if not pending:
+        return counts
+
+    params = ", ".join(f"$o{i}: String!" for i in range(len(pending)))
+    fields = " ".join(
+        f"o{i}: organization(login: $o{i}) {{ membersWithRole {{ totalCount }} }}"
+        for i in range(len(pending))
+    )
+    try:
+        r = _session().post(
+            f"{API}/graphql",
+            headers=_headers(),
+            json={
+                "query": f"query({params}) {{ {fields} }}",
+                "variables": {f"o{i}": org for i, org in enumerate(pending)},
+            },
+            timeout=(5, 30)
+        )
+        if not r.ok:
+            logger.warning(f"GraphQL member count query failed: {r.status_code}")
+            return counts
+        data = r.json().get("data") or {}
+    except Exception as e:
+        logger.error(f"Error querying org member counts: {str(e)}")
+        return counts
+
+    for i, org in enumerate(pending):
+        node = data.get(f"o{i}")
+        if not node:
+            continue
+        count = node["membersWithRole"]["totalCount"]
+        logger.info(f"Organization {org} has {count} members")
+        counts[org] = count
+        if count:
+            cache.put("org_members_count", org, count, MEMBERS_CACHE_TTL)
+    return counts
+
+
+@ttl_cached("copilot_enterprise", COPILOT_CACHE_TTL)
 def get_copilot_enterprise(enterprise: str) -> Dict[str, Any]:
     """Get Copilot billing data for enterprise."""
     try:
-        r = requests.get(
-            f"{API}/enterprises/{enterprise}/copilot/billing",
-            headers=_headers(),
-            timeout=30
+        status, data = _get_json_conditional(
+            "copilot_enterprise", enterprise, f"{API}/enterprises/{enterprise}/copilot/billing"
         )
-        if r.ok:
-            data = r.json()
+        if status < 400:
             logger.info(f"Copilot enterprise data retrieved for {enterprise}")
             return data
         else:
-            logger.warning(f"Failed to get Copilot enterprise data: {r.status_code}")
+            logger.warning(f"Failed to get Copilot enterprise data: {status}")
             return {}
     except Exception as e:
         logger.error(f"Error getting Copilot enterprise data: {str(e)}")
         return {}
 
 
+@ttl_cached("copilot_org", COPILOT_CACHE_TTL)
 def get_copilot_org(org: str) -> Dict[str, Any]:
     """Get Copilot billing data for organization."""
     try:
-        r = requests.get(
-            f"{API}/orgs/{org}/copilot/billing",
-            headers=_headers(),
-            timeout=30
-        )
-        if r.ok:
-            data = r.json()
+        status, data = _get_json_conditional("copilot_org", org, f"{API}/orgs/{org}/copilot/billing")
+        if status < 400:
             logger.info(f"Copilot org data retrieved for {org}")
             return data
         else:
-            logger.warning(f"Failed to get Copilot org data: {r.status_code}")
+            logger.warning(f"Failed to get Copilot org data: {status}")
             return {}
     except Exception as e:
         logger.error(f"Error getting Copilot org data: {str(e)}")
@@ -83,10 +191,10 @@ def get_enterprise_cloud_seats(enterprise: str) -> Dict[str, Any]:
     """Get Enterprise Cloud seats data (best effort)."""
     try:
         # This endpoint may not be available for all accounts
-        r = requests.get(
+        r = _session().get(
             f"{API}/enterprises/{enterprise}/settings/billing/enterprise-cloud",
             headers=_headers(),
-            timeout=30
+            timeout=(5, 30)
         )
         if r.ok:
             return r.json()
@@ -105,30 +213,46 @@ def collect_github(
 ) -> Dict[str, Any]:
     """Collect all GitHub cost data."""
     
+    from github import Github
+    
     # Initialize Github client once
     gh = Github(os.environ.get("GITHUB_TOKEN"))
     
-    # Collect org member counts
-    org_members = []
-    # Note: Proper unique member counting would require fetching actual member IDs
-    # and tracking them across orgs, which may have privacy implications.
-    # For now, we'll use the sum as an upper bound estimate
-    for org in orgs:
-        member_count = list_org_members_count(gh, org)
-        org_members.append({
-            "org": org,
-            "members": member_count
-        })
-    cop = get_copilot_enterprise(enterprise)
+    # The calls below are independent and I/O bound; run them concurrently so
+    # wall time tracks the slowest request rather than the sum of all of them.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="github") as pool:
+        cop_future = pool.submit(get_copilot_enterprise, enterprise)
+        ec_future = pool.submit(get_enterprise_cloud_seats, enterprise)
+        
+        # Collect org member counts
+        # Note: Proper unique member counting would require fetching actual member IDs
+        # and tracking them across orgs, which may have privacy implications.
+        # For now, we'll use the sum as an upper bound estimate
+        # One GraphQL round trip for all orgs; REST (PyGithub) only for orgs it missed
+        member_counts = list_org_members_counts(orgs)
+        missing = [org for org in orgs if org not in member_counts]
+        if missing:
+            rest_counts = pool.map(lambda org: list_org_members_count(gh, org), missing)
+            member_counts.update(zip(missing, rest_counts, strict=True))
+        org_members = [
+            {"org": org, "members": member_counts[org]}
+            for org in orgs
+        ]
+        cop = cop_future.result()
+        
+        if not cop or "seats" not in cop:
+            # Fallback: sum from individual orgs
+            logger.info("Falling back to per-org Copilot data")
+            org_copilot = list(pool.map(get_copilot_org, orgs))
+        else:
+            org_copilot = None
+        ec = ec_future.result()
     
-    if not cop or "seats" not in cop:
-        # Fallback: sum from individual orgs
-        logger.info("Falling back to per-org Copilot data")
+    if org_copilot is not None:
         seats_assigned = 0
         seats_purchased = 0
         
-        for org in orgs:
-            org_data = get_copilot_org(org)
+        for org_data in org_copilot:
             if org_data:
                 seats_assigned += org_data.get("seats_assigned", 0)
                 seats_purchased += org_data.get("seats_purchased", 0)
@@ -149,22 +273,23 @@ def collect_github(
     copilot_price_per_seat = float(pricing.get("copilot_usd_per_seat", 19.0))
     cop_cost = cop.get("seats_purchased", 0) * copilot_price_per_seat
     
-    # Try to get Enterprise Cloud seats
-    ec = get_enterprise_cloud_seats(enterprise)
+    # Enterprise Cloud seats (fetched above, best effort)
     ec_seats = int(ec.get("total_seats", 0) or 0)
     ec_price_per_seat = float(pricing.get("enterprise_cloud_usd_per_seat", 0.0))
     ec_cost = ec_seats * ec_price_per_seat
     
+    # Sum of per-org members (upper bound on unique users, see note above)
+    total_members = sum(om["members"] for om in org_members)
+    
     # If no EC data, estimate from unique users
     if ec_seats == 0 and ec_price_per_seat > 0:
         # Use total members as estimate
-        total_members = sum([om["members"] for om in org_members])
         ec_seats = total_members
         ec_cost = ec_seats * ec_price_per_seat
     
     return {
         "org_members": org_members,
-        "total_members": sum([om["members"] for om in org_members]),
+        "total_members": total_members,
         "copilot": {
             "seats_assigned": cop.get("seats_assigned", 0),
             "seats_purchased": cop.get("seats_purchased", 0),
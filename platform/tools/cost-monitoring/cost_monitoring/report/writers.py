@@ -2,239 +2,252 @@
 Report writers for CSV, Markdown, and JSON formats.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 import csv
-import json
+import heapq
+import itertools
 import datetime as dt
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
-from ..alerting.thresholds import format_alert_message
+from ..alerting.thresholds import format_alert_message, group_alerts_by_severity
+from ..utils.dates import current_month_utc
+from ..utils.fast_json import dumps as json_dumps
 
 logger = logging.getLogger(__name__)
 
 
-def write_markdown(path: str, data: Dict[str, Any]) -> None:
-    """Write markdown report."""
-    with open(path, "w", encoding="utf-8") as f:
-        month = data.get("month", dt.datetime.now().strftime("%Y-%m"))
-        github_data = data.get("github", {})
-        gcp_data = data.get("gcp", {})
-        alerts = data.get("alerts", [])
-        
-        # Header
-        f.write(f"# Cost Report {month}\n\n")
-        f.write(f"Generated: {dt.datetime.now(dt.timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}\n\n")
-        
-        # Summary
-        github_total = github_data.get("total_monthly_cost_usd", 0)
-        gcp_total = gcp_data.get("total_net_usd", 0)
-        grand_total = github_total + gcp_total
-        
-        f.write("## Executive Summary\n\n")
-        f.write(f"- **Total Monthly Cost**: ${grand_total:,.2f}\n")
-        f.write(f"- **GitHub Costs**: ${github_total:,.2f}\n")
-        f.write(f"- **GCP Costs**: ${gcp_total:,.2f}\n")
-        f.write(f"- **Alerts**: {len(alerts)}\n\n")
-        
-        # GitHub Section
-        f.write("## GitHub Enterprise\n\n")
-        
-        copilot = github_data.get("copilot", {})
-        ec = github_data.get("enterprise_cloud", {})
-        
-        f.write("### Copilot\n")
-        f.write(f"- Seats Assigned: {copilot.get('seats_assigned', 0)}\n")
-        f.write(f"- Seats Purchased: {copilot.get('seats_purchased', 0)}\n")
-        f.write(f"- Monthly Cost: ${copilot.get('monthly_cost_usd', 0):,.2f}\n")
-        f.write(f"- Price per Seat: ${copilot.get('price_per_seat', 0):.2f}\n\n")
-        
-        f.write("### Enterprise Cloud\n")
-        f.write(f"- Seats: {ec.get('seats', 0)}\n")
-        f.write(f"- Monthly Cost: ${ec.get('monthly_cost_usd', 0):,.2f}\n")
-        f.write(f"- Price per Seat: ${ec.get('price_per_seat', 0):.2f}\n\n")
-        
-        # Organization members
-        org_members = github_data.get("org_members", [])
-        if org_members:
-            f.write("### Organization Members\n\n")
-            f.write("| Organization | Members |\n")
-            f.write("|--------------|--------:|\n")
-            for om in org_members:
-                f.write(f"| {om['org']} | {om['members']} |\n")
-            f.write("\n")
-        
-        # GCP Section
-        f.write("## GCP Costs\n\n")
-        f.write(f"- **Projects Monitored**: {gcp_data.get('projects_monitored', 0)}\n")
-        f.write(f"- **Total Cost**: ${gcp_data.get('total_cost_usd', 0):,.2f}\n")
-        f.write(f"- **Total Credits**: ${gcp_data.get('total_credits_usd', 0):,.2f}\n")
-        f.write(f"- **Net Cost**: ${gcp_data.get('total_net_usd', 0):,.2f}\n\n")
+# Markdown table headers (section title + column row + alignment row)
+_ORG_TBL_HEADER = (
+    "### Organization Members\n\n"
+    "| Organization | Members |\n"
+    "|--------------|--------:|\n"
+)
+_PROJECTS_TBL_HEADER = (
+    "### Top Projects by Cost\n\n"
+    "| Project | Net Cost | Top Service | Service Cost |\n"
+    "|---------|----------:|-------------|-------------:|\n"
+)
+_BUDGETS_TBL_HEADER = (
+    "### Configured Budgets\n\n"
+    "| Budget | Amount | Projects |\n"
+    "|--------|--------:|----------|\n"
+)
+
+
+def _project_row_md(project: Dict[str, Any]) -> str:
+    """One "Top Projects by Cost" table row."""
+    # Get top service
+    services = project.get("services", [])
+    if services:
+        top_service = max(services, key=lambda s: s["net_cost_usd"])
+        service_name = top_service["service"][:30]  # Truncate long names
+        service_cost = top_service["net_cost_usd"]
+    else:
+        service_name = "N/A"
+        service_cost = 0
+    return f"| {project['project_id']} | ${project['total_net_usd']:,.2f} | {service_name} | ${service_cost:,.2f} |\n"
+
+
+def _budget_row_md(budget: Dict[str, Any]) -> str:
+    """One "Configured Budgets" table row."""
+    name = budget.get("display_name", budget.get("name", ""))[:40]
+    amount = budget.get("amount_usd", 0)
+    projects = ", ".join(budget.get("projects", [])[:3])
+    if len(budget.get("projects", [])) > 3:
+        projects += f" (+{len(budget['projects']) - 3} more)"
+    return f"| {name} | ${amount:,.2f} | {projects} |\n"
+
+
+def render_markdown(
+    data: Dict[str, Any],
+    generated_at: Optional[dt.datetime] = None,
+    alerts_by_severity: Optional[Dict[str, List[Dict[str, Any]]]] = None
+) -> str:
+    """Render the markdown report; fragments are collected and joined once.
+
+    ``generated_at`` (UTC) defaults to now and ``alerts_by_severity`` to
+    ``group_alerts_by_severity(data["alerts"])``; ``write_all_reports`` passes
+    both, computed once for all writers.
+    """
+    if generated_at is None:
+        generated_at = dt.datetime.now(dt.timezone.utc)
+    parts: List[str] = []
+    w = parts.append
+    
+    month = data.get("month") or generated_at.strftime("%Y-%m")
+    github_data = data.get("github", {})
+    gcp_data = data.get("gcp", {})
+    alerts = data.get("alerts", [])
+    
+    # Header
+    w(f"# Cost Report {month}\n\n")
+    w(f"Generated: {generated_at.strftime('%Y-%m-%d %H:%M UTC')}\n\n")
+    
+    # Summary
+    github_total = github_data.get("total_monthly_cost_usd", 0)
+    gcp_total = gcp_data.get("total_net_usd", 0)
+    grand_total = github_total + gcp_total
+    
+    w("## Executive Summary\n\n")
+    w(f"- **Total Monthly Cost**: ${grand_total:,.2f}\n")
+    w(f"- **GitHub Costs**: ${github_total:,.2f}\n")
+    w(f"- **GCP Costs**: ${gcp_total:,.2f}\n")
+    w(f"- **Alerts**: {len(alerts)}\n\n")
+    
+    # GitHub Section
+    w("## GitHub Enterprise\n\n")
+    
+    copilot = github_data.get("copilot", {})
+    ec = github_data.get("enterprise_cloud", {})
+    
+    w("### Copilot\n")
+    w(f"- Seats Assigned: {copilot.get('seats_assigned', 0)}\n")
+    w(f"- Seats Purchased: {copilot.get('seats_purchased', 0)}\n")
+    w(f"- Monthly Cost: ${copilot.get('monthly_cost_usd', 0):,.2f}\n")
+    w(f"- Price per Seat: ${copilot.get('price_per_seat', 0):.2f}\n\n")
+    
+    w("### Enterprise Cloud\n")
+    w(f"- Seats: {ec.get('seats', 0)}\n")
+    w(f"- Monthly Cost: ${ec.get('monthly_cost_usd', 0):,.2f}\n")
+    w(f"- Price per Seat: ${ec.get('price_per_seat', 0):.2f}\n\n")
+    
+    # Organization members
+    org_members = github_data.get("org_members", [])
+    if org_members:
+        w(_ORG_TBL_HEADER)
+        w("".join(f"| {om['org']} | {om['members']} |\n" for om in org_members))
+        w("\n")
+    
+    # GCP Section
+    w("## GCP Costs\n\n")
+    w(f"- **Projects Monitored**: {gcp_data.get('projects_monitored', 0)}\n")
+    w(f"- **Total Cost**: ${gcp_data.get('total_cost_usd', 0):,.2f}\n")
+    w(f"- **Total Credits**: ${gcp_data.get('total_credits_usd', 0):,.2f}\n")
+    w(f"- **Net Cost**: ${gcp_data.get('total_net_usd', 0):,.2f}\n\n")
+    
+    # Top projects by cost
+    project_costs = gcp_data.get("project_costs", [])
+    if project_costs:
+        w(_PROJECTS_TBL_HEADER)
         
-        # Top projects by cost
-        project_costs = gcp_data.get("project_costs", [])
-        if project_costs:
-            f.write("### Top Projects by Cost\n\n")
-            f.write("| Project | Net Cost | Top Service | Service Cost |\n")
-            f.write("|---------|----------:|-------------|-------------:|\n")
-            
-            # Sort by net cost
-            sorted_projects = sorted(project_costs, key=lambda x: x["total_net_usd"], reverse=True)
-            
-            for project in sorted_projects[:10]:
-                project_id = project["project_id"]
-                net_cost = project["total_net_usd"]
-                
-                # Get top service
-                services = project.get("services", [])
-                if services:
-                    top_service = max(services, key=lambda s: s["net_cost_usd"])
-                    service_name = top_service["service"][:30]  # Truncate long names
-                    service_cost = top_service["net_cost_usd"]
-                else:
-                    service_name = "N/A"
-                    service_cost = 0
-                
-                f.write(f"| {project_id} | ${net_cost:,.2f} | {service_name} | ${service_cost:,.2f} |\n")
-            
-            f.write("\n")
+        # Top 10 by net cost (same order as a full descending sort, without sorting everything)
+        top_projects = heapq.nlargest(10, project_costs, key=lambda x: x["total_net_usd"])
+        w("".join(map(_project_row_md, top_projects)))
+        w("\n")
+    
+    # Budgets
+    budgets = gcp_data.get("budgets", [])
+    if budgets:
+        w(_BUDGETS_TBL_HEADER)
         
-        # Budgets
-        budgets = gcp_data.get("budgets", [])
-        if budgets:
-            f.write("### Configured Budgets\n\n")
-            f.write("| Budget | Amount | Projects |\n")
-            f.write("|--------|--------:|----------|\n")
-            
-            for budget in budgets[:10]:
-                name = budget.get("display_name", budget.get("name", ""))[:40]
-                amount = budget.get("amount_usd", 0)
-                projects = ", ".join(budget.get("projects", [])[:3])
-                if len(budget.get("projects", [])) > 3:
-                    projects += f" (+{len(budget['projects']) - 3} more)"
-                
-                f.write(f"| {name} | ${amount:,.2f} | {projects} |\n")
-            
-            f.write("\n")
+        w("".join(map(_budget_row_md, budgets[:10])))
+        w("\n")
+    
+    # Alerts
+    if alerts:
+        w("## ⚠️ Threshold Alerts\n\n")
         
-        # Alerts
-        if alerts:
-            f.write("## ⚠️ Threshold Alerts\n\n")
-            
-            # Group by severity
-            high_alerts = [a for a in alerts if a.get("severity") == "high"]
-            medium_alerts = [a for a in alerts if a.get("severity") == "medium"]
-            
-            if high_alerts:
-                f.write("### 🔴 High Priority\n\n")
-                for alert in high_alerts:
-                    f.write(f"- {format_alert_message(alert)}\n")
-                f.write("\n")
-            
-            if medium_alerts:
-                f.write("### 🟡 Medium Priority\n\n")
-                for alert in medium_alerts[:10]:  # Limit to 10
-                    f.write(f"- {format_alert_message(alert)}\n")
-                if len(medium_alerts) > 10:
-                    f.write(f"- ... and {len(medium_alerts) - 10} more\n")
-                f.write("\n")
+        # Only high and medium alerts are listed here
+        if alerts_by_severity is None:
+            alerts_by_severity = group_alerts_by_severity(alerts)
+        high_alerts = alerts_by_severity["high"]
+        medium_alerts = alerts_by_severity["medium"]
         
-        # Footer
-        f.write("---\n\n")
-        f.write("*For full details, see the CSV and JSON reports.*\n")
+        if high_alerts:
+            w("### 🔴 High Priority\n\n")
+            for alert in high_alerts:
+                w(f"- {format_alert_message(alert)}\n")
+            w("\n")
         
+        if medium_alerts:
+            w("### 🟡 Medium Priority\n\n")
+            for alert in medium_alerts[:10]:  # Limit to 10
+                w(f"- {format_alert_message(alert)}\n")
+            if len(medium_alerts) > 10:
+                w(f"- ... and {len(medium_alerts) - 10} more\n")
+            w("\n")
+    
+    # Footer
+    w("---\n\n")
+    w("*For full details, see the CSV and JSON reports.*\n")
+    
+    return "".join(parts)
+
+
+def write_markdown(
+    path: str,
+    data: Dict[str, Any],
+    generated_at: Optional[dt.datetime] = None,
+    alerts_by_severity: Optional[Dict[str, List[Dict[str, Any]]]] = None
+) -> None:
+    """Write markdown report."""
+    Path(path).write_text(render_markdown(data, generated_at, alerts_by_severity), encoding="utf-8")
     logger.info(f"Markdown report written to {path}")
 
 
-def write_csv(path: str, rows: List[Dict[str, Any]]) -> None:
-    """Write CSV report."""
-    if not rows:
+# CSV column order; prepare_csv_rows builds tuples in exactly this order
+CSV_FIELDS = ("source", "scope", "project", "service", "metric", "value", "currency", "month")
+
+CsvRow = Tuple[str, str, str, str, str, Any, str, str]
+
+# Buffer for streamed report files; markdown and JSON are rendered in memory
+# and reach the OS in a single write already
+_WRITE_BUFFER = 1 << 20
+
+
+def write_csv(path: str, rows: Iterable[CsvRow]) -> None:
+    """Write CSV report, streaming ``rows`` (e.g. from ``prepare_csv_rows``) straight to the writer."""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
         logger.warning("No data to write to CSV")
         return
     
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        fields = ["source", "scope", "project", "service", "metric", "value", "currency", "month"]
-        writer = csv.DictWriter(f, fieldnames=fields)
-        writer.writeheader()
-        writer.writerows(rows)
+    row_count = 0
+
+    def counted(it: Iterable[CsvRow]) -> Iterator[CsvRow]:
+        nonlocal row_count
+        for row in it:
+            row_count += 1
+            yield row
+
+    with open(path, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER) as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        writer.writerows(counted(itertools.chain((first,), rows)))
     
-    logger.info(f"CSV report written to {path} ({len(rows)} rows)")
+    logger.info(f"CSV report written to {path} ({row_count} rows)")
 
 
 def write_json(path: str, payload: Dict[str, Any]) -> None:
     """Write JSON report."""
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2, ensure_ascii=False, default=str)
+    # orjson when installed (speedups extra); one encode, one write
+    Path(path).write_bytes(json_dumps(payload, indent=True))
     
     logger.info(f"JSON report written to {path}")
 
 
-def prepare_csv_rows(data: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Prepare data rows for CSV export."""
-    rows = []
-    month = data.get("month", dt.datetime.now().strftime("%Y-%m"))
+def prepare_csv_rows(data: Dict[str, Any], month: Optional[str] = None) -> Iterator[CsvRow]:
+    """Yield data rows for CSV export, as tuples in ``CSV_FIELDS`` order."""
+    month = month or data.get("month") or current_month_utc()
     
     # GitHub rows
     github_data = data.get("github", {})
-    
-    # Copilot
     copilot = github_data.get("copilot", {})
-    rows.append({
-        "source": "github",
-        "scope": "enterprise",
-        "project": "",
-        "service": "Copilot",
-        "metric": "seats_assigned",
-        "value": copilot.get("seats_assigned", 0),
-        "currency": "count",
-        "month": month
-    })
-    rows.append({
-        "source": "github",
-        "scope": "enterprise",
-        "project": "",
-        "service": "Copilot",
-        "metric": "monthly_cost",
-        "value": copilot.get("monthly_cost_usd", 0),
-        "currency": "USD",
-        "month": month
-    })
+    ec = github_data.get("enterprise_cloud", {})
     
+    # Copilot
+    yield ("github", "enterprise", "", "Copilot", "seats_assigned", copilot.get("seats_assigned", 0), "count", month)
+    yield ("github", "enterprise", "", "Copilot", "monthly_cost", copilot.get("monthly_cost_usd", 0), "USD", month)
     # Enterprise Cloud
-    ec = github_data.get("enterprise_cloud", {})
-    rows.append({
-        "source": "github",
-        "scope": "enterprise",
-        "project": "",
-        "service": "Enterprise Cloud",
-        "metric": "seats",
-        "value": ec.get("seats", 0),
-        "currency": "count",
-        "month": month
-    })
-    rows.append({
-        "source": "github",
-        "scope": "enterprise",
-        "project": "",
-        "service": "Enterprise Cloud",
-        "metric": "monthly_cost",
-        "value": ec.get("monthly_cost_usd", 0),
-        "currency": "USD",
-        "month": month
-    })
+    yield ("github", "enterprise", "", "Enterprise Cloud", "seats", ec.get("seats", 0), "count", month)
+    yield ("github", "enterprise", "", "Enterprise Cloud", "monthly_cost", ec.get("monthly_cost_usd", 0), "USD", month)
     
     # Organization members
     for om in github_data.get("org_members", []):
-        rows.append({
-            "source": "github",
-            "scope": "organization",
-            "project": om["org"],
-            "service": "Members",
-            "metric": "count",
-            "value": om["members"],
-            "currency": "count",
-            "month": month
-        })
+        yield ("github", "organization", om["org"], "Members", "count", om["members"], "count", month)
     
     # GCP rows
     gcp_data = data.get("gcp", {})
@@ -244,71 +257,79 @@ def prepare_csv_rows(data: Dict[str, Any]) -> List[Dict[str, Any]]:
         project_id = project_cost["project_id"]
         
         # Total for project
-        rows.append({
-            "source": "gcp",
-            "scope": "project",
-            "project": project_id,
-            "service": "Total",
-            "metric": "net_cost",
-            "value": project_cost["total_net_usd"],
-            "currency": "USD",
-            "month": month
-        })
+        yield ("gcp", "project", project_id, "Total", "net_cost", project_cost["total_net_usd"], "USD", month)
         
         # Per service
         for service in project_cost.get("services", []):
-            rows.append({
-                "source": "gcp",
-                "scope": "service",
-                "project": project_id,
-                "service": service["service"],
-                "metric": "net_cost",
-                "value": service["net_cost_usd"],
-                "currency": "USD",
-                "month": month
-            })
-    
-    return rows
+            yield ("gcp", "service", project_id, service["service"], "net_cost", service["net_cost_usd"], "USD", month)
+
+
+# Accepted `--formats` names -> report key used in the returned paths
+REPORT_FORMATS = {"csv": "csv", "md": "markdown", "markdown": "markdown", "json": "json"}
 
 
 def write_all_reports(
     output_dir: str,
     data: Dict[str, Any],
-    month: Optional[str] = None
+    month: Optional[str] = None,
+    formats: Optional[Iterable[str]] = None
 ) -> Dict[str, str]:
-    """Write all report formats."""
+    """Write the requested report formats (all of them by default)."""
+    
+    # Resolve requested formats, preserving order and dropping duplicates
+    if formats is None:
+        formats = ("csv", "md", "json")
+    requested: Dict[str, None] = {}
+    for fmt in formats:
+        name = fmt.strip().lower()
+        if not name:
+            continue
+        key = REPORT_FORMATS.get(name)
+        if key is None:
+            logger.warning(f"Unknown report format ignored: {fmt}")
+        else:
+            requested[key] = None
     
     # Ensure output directory exists
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     
+    # One timestamp for every writer: report header, JSON `generated_at` and default month
+    generated_at = dt.datetime.now(dt.timezone.utc)
+    
     # Determine month
     if not month:
-        month = dt.datetime.now().strftime("%Y-%m")
+        month = generated_at.strftime("%Y-%m")
     
     # File paths
     base_name = f"costs_report_{month.replace('-', '_')}"
-    csv_path = Path(output_dir) / f"{base_name}.csv"
-    md_path = Path(output_dir) / f"{base_name}.md"
-    json_path = Path(output_dir) / f"{base_name}.json"
+    paths = {
+        "csv": Path(output_dir) / f"{base_name}.csv",
+        "markdown": Path(output_dir) / f"{base_name}.md",
+        "json": Path(output_dir) / f"{base_name}.json",
+    }
     
     # Add month to data if not present
     data["month"] = month
+    if "json" in requested:
+        data["generated_at"] = generated_at.isoformat()
     
-    # Write CSV
-    csv_rows = prepare_csv_rows(data)
-    write_csv(str(csv_path), csv_rows)
+    # Shared derived data, computed once before the writers start
+    alerts_by_severity = group_alerts_by_severity(data.get("alerts", []))
     
-    # Write Markdown
-    write_markdown(str(md_path), data)
+    writers = {
+        "csv": lambda path: write_csv(path, prepare_csv_rows(data, month)),
+        "markdown": lambda path: write_markdown(path, data, generated_at, alerts_by_severity),
+        "json": lambda path: write_json(path, data),
+    }
+    jobs = [(key, writers[key], str(paths[key])) for key in requested]
     
-    # Write JSON
-    data["generated_at"] = dt.datetime.now(dt.timezone.utc).isoformat()
-    write_json(str(json_path), data)
+    # Writers only read `data` and each owns its file, so they can run side by side
+    if len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="report") as pool:
+            for future in [pool.submit(write, path) for _, write, path in jobs]:
+                future.result()
+    else:
+        for _, write, path in jobs:
+            write(path)
     
-    return {
-        "csv": str(csv_path),
-        "markdown": str(md_path),
-        "json": str(json_path)
-    }
-
-
+    return {key: path for key, _, path in jobs}
@@ -0,0 +1,90 @@
+"""Small on-disk TTL cache for slow-changing API responses.
+
+Entries are JSON files under ``$XDG_CACHE_HOME/merglbot-cost`` (``~/.cache`` when
+unset), so repeated runs within the TTL skip the network entirely.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import time
+from typing import Any, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled = os.environ.get("COST_MONITORING_NO_CACHE", "") == ""
+
+
+def set_enabled(enabled: bool) -> None:
+    """Turn the cache on or off for this process (used by ``--no-cache``)."""
+    global _enabled
+    _enabled = enabled
+
+
+def cache_dir() -> pathlib.Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return pathlib.Path(base) / "merglbot-cost"
+
+
+def _path(endpoint: str, arg: str) -> pathlib.Path:
+    key = hashlib.sha256(f"{endpoint}|{arg}".encode("utf-8")).hexdigest()
+    return cache_dir() / f"{key}.json"
+
+
+def get(endpoint: str, arg: str) -> Optional[Any]:
+    """Return the cached value for ``(endpoint, arg)`` or ``None`` if missing/expired."""
+    if not _enabled:
+        return None
+    try:
+        with open(_path(endpoint, arg), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get("expires", 0) < time.time():
+        return None
+    return entry.get("value")
+
+
+def put(endpoint: str, arg: str, value: Any, ttl: float) -> None:
+    """Store ``value`` for ``ttl`` seconds; cache write failures are never fatal."""
+    if not _enabled:
+        return
+    path = _path(endpoint, arg)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"expires": time.time() + ttl, "value": value}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug(f"Could not write cache entry {path}: {e}")
+
+
+def ttl_cached(endpoint: str, ttl: float) -> Callable[[F], F]:
+    """Cache a fetcher's result keyed by ``endpoint`` and its last positional argument.
+
+    Empty results (``{}``, ``0``) are what the fetchers return on failure, so
+    they are not stored and the next run retries the API.
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any) -> Any:
+            arg = str(args[-1]) if args else ""
+            cached = get(endpoint, arg)
+            if cached is not None:
+                return cached
+            value = func(*args)
+            if value:
+                put(endpoint, arg, value, ttl)
+            return value
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,9 @@
+"""Date helpers shared by the CLI, collectors and report writers."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+
+def current_month_utc() -> str:
+    """Current month as ``YYYY-MM`` in UTC (BigQuery billing export timestamps are UTC)."""
+    return datetime.now(timezone.utc).strftime("%Y-%m")
@@ -1,6 +1,10 @@
-import pytest
+import datetime as dt
+import time
 
+import pytest
+from google.cloud.bigquery.table import Row
 
+from cost_monitoring import ai_usage_alerts
 from cost_monitoring.utils.anomaly_config import parse_daily_spike_factor
 
 
@@ -17,11 +21,151 @@ def test_daily_spike_pct_integer_percent() -> None:
     assert parse_daily_spike_factor({"daily_spike_pct": 150}) == pytest.approx(2.5)
 
 
-def test_daily_spike_pct_invalid_warns_and_defaults(capsys: pytest.CaptureFixture[str]) -> None:
+def test_daily_spike_pct_invalid_warns_and_defaults(caplog: pytest.LogCaptureFixture) -> None:
     assert parse_daily_spike_factor({"daily_spike_pct": 1.01}) == pytest.approx(2.0)
-    captured = capsys.readouterr()
-    assert "WARN:" in captured.err
+    assert "invalid anomaly config" in caplog.text
 
 
 def test_daily_spike_factor_direct() -> None:
     assert parse_daily_spike_factor({"daily_spike_factor": 3.0}) == pytest.approx(3.0)
+
+
+def _bq_rows(*rows: dict) -> list:
+    fields = ("grain", "event_date", "provider", "product", "cost_usd", "projected_month_usd")
+    index = {name: i for i, name in enumerate(fields)}
+    return [Row(tuple(r.get(name) for name in fields), index) for r in rows]
+
+
+class _FakeBigQuery:
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+        self.queries: list = []
+
+    def query_and_wait(self, query: str, **kwargs) -> list:
+        self.queries.append((query, kwargs.get("job_config")))
+        return self.rows
+
+
+def test_get_usage_spend_splits_grains_from_one_job(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = _FakeBigQuery(
+        _bq_rows(
+            {"grain": "mtd", "provider": "openai", "product": "api", "cost_usd": 12.5, "projected_month_usd": 40.0},
+            {"grain": "daily", "event_date": dt.date(2026, 1, 2), "provider": "openai", "cost_usd": 3.0},
+            {"grain": "daily", "event_date": dt.date(2026, 1, 3), "provider": "openai", "cost_usd": None},
+        )
+    )
+    monkeypatch.setattr(ai_usage_alerts, "_bq_client", lambda project_id: fake)
+    monkeypatch.setattr(
+        ai_usage_alerts, "_utc_now", lambda: dt.datetime(2026, 2, 10, 6, 0, tzinfo=dt.timezone.utc)
+    )
+
+    mtd_rows, daily_rows = ai_usage_alerts.get_usage_spend("proj", "ai_usage", days=14)
+
+    assert len(fake.queries) == 1
+    query, job_config = fake.queries[0]
+    assert "@days" in query and "current_date()" not in query
+    assert {p.name: p.value for p in job_config.query_parameters} == {
+        "days": 14,
+        "today": dt.date(2026, 2, 10),
+        "dom": 10,
+        "dim": 28,
+    }
+    assert mtd_rows == [
+        {"provider": "openai", "product": "api", "cost_mtd_usd": 12.5, "projected_month_usd": 40.0},
+    ]
+    assert daily_rows == [
+        {"event_date": dt.date(2026, 1, 2), "provider": "openai", "cost_usd": 3.0},
+        {"event_date": dt.date(2026, 1, 3), "provider": "openai", "cost_usd": 0.0},
+    ]
+
+
+def test_evaluate_budget_alerts_scopes_spend_by_provider_and_product() -> None:
+    spend_rows = [
+        {"provider": "openai", "product": "api", "cost_mtd_usd": 60.0, "projected_month_usd": 90.0},
+        {"provider": "openai", "product": "chat", "cost_mtd_usd": 30.0, "projected_month_usd": 45.0},
+        {"provider": "anthropic", "product": None, "cost_mtd_usd": 5.0, "projected_month_usd": 8.0},
+    ]
+    budgets = [
+        ai_usage_alerts.BudgetItem(id="openai:all", provider="openai", product=None, monthly_budget_usd=100.0),
+        ai_usage_alerts.BudgetItem(id="openai:chat", provider="openai", product="chat", monthly_budget_usd=100.0),
+        ai_usage_alerts.BudgetItem(id="anthropic:all", provider="anthropic", product=None, monthly_budget_usd=100.0),
+        ai_usage_alerts.BudgetItem(id="missing", provider="gemini", product=None, monthly_budget_usd=1.0),
+    ]
+
+    alerts = ai_usage_alerts.evaluate_budget_alerts(budgets, spend_rows)
+
+    assert [a["budget_id"] for a in alerts] == ["openai:all"]
+    assert alerts[0]["mtd_cost_usd"] == pytest.approx(90.0)
+    assert alerts[0]["projected_month_usd"] == pytest.approx(135.0)
+    assert alerts[0]["severity"] == "HIGH"
+
+
+def test_evaluate_anomaly_alerts_flags_spike_against_prev7_average(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = dt.datetime(2026, 3, 10, 6, 0, tzinfo=dt.timezone.utc)
+    monkeypatch.setattr(ai_usage_alerts, "_utc_now", lambda: now)
+    yesterday = dt.date(2026, 3, 9)
+
+    daily_rows = [
+        {"event_date": yesterday - dt.timedelta(days=i), "provider": "openai", "cost_usd": 10.0} for i in range(1, 8)
+    ]
+    daily_rows += [
+        {"event_date": yesterday, "provider": "openai", "cost_usd": 50.0},
+        {"event_date": yesterday, "provider": "anthropic", "cost_usd": 50.0},  # no history -> avg 0, skipped
+        {"event_date": str(yesterday), "provider": "gemini", "cost_usd": 5.0},  # below min_usd; ISO string date
+        {"event_date": yesterday - dt.timedelta(days=3), "provider": "gemini", "cost_usd": 1.0},
+        # Outside the prev7 window (yesterday-8); must not affect the average.
+        {"event_date": yesterday - dt.timedelta(days=8), "provider": "openai", "cost_usd": 1000.0},
+    ]
+
+    alerts = ai_usage_alerts.evaluate_anomaly_alerts(daily_rows, spike_factor=2.0)
+
+    assert alerts == [
+        {
+            "type": "ai_usage_anomaly",
+            "severity": "WARN",
+            "provider": "openai",
+            "yesterday_cost_usd": 50.0,
+            "avg_prev7_cost_usd": pytest.approx(10.0),
+            "spike_factor": 2.0,
+        }
+    ]
+
+
+def test_main_reports_budget_breach_and_posts_to_slack(monkeypatch: pytest.MonkeyPatch) -> None:
+    config = {"budgets": [{"provider": "openai", "monthly_budget_usd": 100}]}
+    spend = ([{"provider": "openai", "product": "api", "cost_mtd_usd": 95.0, "projected_month_usd": 120.0}], [])
+    posted: list = []
+
+    monkeypatch.setattr(ai_usage_alerts, "load_budget_config", lambda project_id: config)
+    monkeypatch.setattr(ai_usage_alerts, "get_usage_spend", lambda project_id, dataset: spend)
+    monkeypatch.setattr(ai_usage_alerts, "send_slack", lambda url, text, blocks: posted.append(text) or True)
+    monkeypatch.setenv("SLACK_WEBHOOK_URL", "https://hooks.slack.com/services/test")
+
+    assert ai_usage_alerts.main() == 2
+    assert len(posted) == 1 and posted[0].endswith(": 1")
+
+
+def test_main_still_reports_alerts_when_slack_post_is_slow_and_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    config = {"budgets": [{"provider": "openai", "monthly_budget_usd": 100}]}
+    spend = ([{"provider": "openai", "product": "api", "cost_mtd_usd": 150.0, "projected_month_usd": 200.0}], [])
+    calls: list = []
+
+    def slow_failing_send_slack(url: str, text: str, blocks: list) -> bool:
+        time.sleep(0.2)
+        calls.append(url)
+        return False
+
+    monkeypatch.setattr(ai_usage_alerts, "load_budget_config", lambda project_id: config)
+    monkeypatch.setattr(ai_usage_alerts, "get_usage_spend", lambda project_id, dataset: spend)
+    monkeypatch.setattr(ai_usage_alerts, "send_slack", slow_failing_send_slack)
+    monkeypatch.setenv("SLACK_WEBHOOK_URL", "https://hooks.slack.com/services/test")
+
+    assert ai_usage_alerts.main() == 2
+    assert calls == ["https://hooks.slack.com/services/test"]
+
+
+def test_main_ok_without_alerts(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ai_usage_alerts, "load_budget_config", lambda project_id: {})
+    monkeypatch.setattr(ai_usage_alerts, "get_usage_spend", lambda project_id, dataset: ([], []))
+
+    assert ai_usage_alerts.main() == 0
@@ -17,17 +17,15 @@ def test_daily_spike_pct_integer_percent() -> None:
     assert parse_daily_spike_factor({"daily_spike_pct": 150}) == pytest.approx(2.5)
 
 
-def test_daily_spike_pct_invalid_warns_and_defaults(capsys: pytest.CaptureFixture[str]) -> None:
+def test_daily_spike_pct_invalid_warns_and_defaults(caplog: pytest.LogCaptureFixture) -> None:
     assert parse_daily_spike_factor({"daily_spike_pct": 1.01}) == pytest.approx(2.0)
-    captured = capsys.readouterr()
-    assert "WARN:" in captured.err
+    assert "invalid anomaly config" in caplog.text
 
 
 def test_daily_spike_factor_direct() -> None:
     assert parse_daily_spike_factor({"daily_spike_factor": 3.0}) == pytest.approx(3.0)
 
 
-def test_daily_spike_factor_nan_warns_and_defaults(capsys: pytest.CaptureFixture[str]) -> None:
+def test_daily_spike_factor_nan_warns_and_defaults(caplog: pytest.LogCaptureFixture) -> None:
     assert parse_daily_spike_factor({"daily_spike_factor": "nan"}) == pytest.approx(2.0)
-    captured = capsys.readouterr()
-    assert "WARN:" in captured.err
+    assert "invalid anomaly config" in caplog.text
@@ -0,0 +1,51 @@
+import pytest
+
+from cost_monitoring.utils import cache
+
+
+@pytest.fixture(autouse=True)
+def _cache_home(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(cache, "_enabled", True)
+
+
+def test_ttl_cached_reuses_result_across_calls() -> None:
+    calls = []
+
+    @cache.ttl_cached("copilot_org", ttl=60)
+    def fetch(org: str) -> dict:
+        calls.append(org)
+        return {"seats_purchased": 3}
+
+    assert fetch("acme") == {"seats_purchased": 3}
+    assert fetch("acme") == {"seats_purchased": 3}
+    assert fetch("other") == {"seats_purchased": 3}
+    assert calls == ["acme", "other"]
+
+
+def test_ttl_cached_skips_empty_results_and_expired_entries(monkeypatch: pytest.MonkeyPatch) -> None:
+    results = [{}, {"seats": 1}, {"seats": 2}]
+
+    @cache.ttl_cached("copilot_enterprise", ttl=60)
+    def fetch(enterprise: str) -> dict:
+        return results.pop(0)
+
+    assert fetch("ent") == {}
+    assert fetch("ent") == {"seats": 1}
+    now = cache.time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now + 61)
+    assert fetch("ent") == {"seats": 2}
+
+
+def test_set_enabled_false_bypasses_cache() -> None:
+    calls = []
+
+    @cache.ttl_cached("org_members_count", ttl=60)
+    def fetch(gh: object, org: str) -> int:
+        calls.append(org)
+        return 5
+
+    cache.set_enabled(False)
+    fetch(None, "acme")
+    fetch(None, "acme")
+    assert calls == ["acme", "acme"]
@@ -0,0 +1,17 @@
+import json
+
+from click.testing import CliRunner
+
+from cost_monitoring.cli import cli
+
+
+def test_print_config_keeps_long_values_intact_when_piped(tmp_path) -> None:
+    long_value = "x" * 150
+    config = tmp_path / "settings.yml"
+    config.write_text(f"github:\n  enterprise: {long_value}\n", encoding="utf-8")
+
+    result = CliRunner().invoke(cli, ["print-config", "--config", str(config)])
+
+    assert result.exit_code == 0
+    payload = result.output[result.output.index("{"):]
+    assert json.loads(payload) == {"github": {"enterprise": long_value}}
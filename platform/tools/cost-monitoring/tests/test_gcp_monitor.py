@@ -0,0 +1,37 @@
+import pytest
+from google.cloud.bigquery.table import Row
+
+from cost_monitoring.monitor import gcp_monitor
+
+_FIELDS = {"project_id": 0, "service": 1, "cost_usd": 2, "credits_usd": 3}
+
+
+class _FakeBigQuery:
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+        self.project_ids: list = []
+
+    def query_and_wait(self, sql: str, job_config) -> list:
+        self.project_ids = list(job_config.query_parameters[0].values)
+        return self.rows
+
+
+def test_collect_gcp_counts_a_project_listed_in_several_categories_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    rows = [Row((pid, "BigQuery", 10.0, 0.0), _FIELDS) for pid in ("proj-a", "proj-b", "proj-c")]
+    bq = _FakeBigQuery(rows)
+    monkeypatch.setattr(gcp_monitor, "_bq_client", lambda project_id: bq)
+    config = {
+        "billing_export": {"project_id": "billing", "dataset": "export"},
+        "projects": {
+            "internal": ["proj-a", "proj-b"],
+            "clients": {"acme": ["proj-b", "proj-c"], "globex": ["proj-c", "proj-c"]},
+        },
+    }
+
+    result = gcp_monitor.collect_gcp(config, "2026-03")
+
+    # 6 entries in the config, 3 distinct projects
+    assert result["projects_monitored"] == 3
+    assert bq.project_ids == ["proj-a", "proj-b", "proj-c"]
+    assert result["total_cost_usd"] == pytest.approx(30.0)
+    assert [p["project_id"] for p in result["categorized_costs"]["clients"]["globex"]["projects"]] == ["proj-c"]
@@ -0,0 +1,90 @@
+import pytest
+
+from cost_monitoring.monitor import github_monitor
+from cost_monitoring.utils import cache
+
+
+class _FakeResponse:
+    ok = True
+
+    def __init__(self, payload: dict) -> None:
+        self.payload = payload
+
+    def json(self) -> dict:
+        return self.payload
+
+
+class _FakeSession:
+    def __init__(self, payload: dict) -> None:
+        self.payload = payload
+        self.requests: list = []
+
+    def post(self, url: str, **kwargs) -> _FakeResponse:
+        self.requests.append((url, kwargs["json"]))
+        return _FakeResponse(self.payload)
+
+
+def test_list_org_members_counts_batches_orgs_into_one_graphql_query(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    monkeypatch.setattr(cache, "_enabled", False)
+    session = _FakeSession({"data": {"o0": {"membersWithRole": {"totalCount": 12}}, "o1": None}})
+    monkeypatch.setattr(github_monitor, "_session", lambda: session)
+
+    counts = github_monitor.list_org_members_counts(["acme", "missing", "acme"])
+
+    assert counts == {"acme": 12}
+    assert len(session.requests) == 1
+    url, body = session.requests[0]
+    assert url == "https://api.github.com/graphql"
+    assert body["variables"] == {"o0": "acme", "o1": "missing"}
+
+
+def test_list_org_members_counts_requeries_after_member_ttl(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(cache, "_enabled", True)
+    session = _FakeSession({"data": {"o0": {"membersWithRole": {"totalCount": 12}}}})
+    monkeypatch.setattr(github_monitor, "_session", lambda: session)
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+
+    assert github_monitor.list_org_members_counts(["acme"]) == {"acme": 12}
+    assert github_monitor.list_org_members_counts(["acme"]) == {"acme": 12}
+    assert len(session.requests) == 1
+
+    now[0] += github_monitor.MEMBERS_CACHE_TTL + 1
+    session.payload = {"data": {"o0": {"membersWithRole": {"totalCount": 13}}}}
+    assert github_monitor.list_org_members_counts(["acme"]) == {"acme": 13}
+    assert len(session.requests) == 2
+
+
+class _FakeGetResponse:
+    def __init__(self, status_code: int, payload: dict, etag: str = "") -> None:
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.headers = {"ETag": etag} if etag else {}
+        self.payload = payload
+
+    def json(self) -> dict:
+        return self.payload
+
+
+def test_get_copilot_org_revalidates_expired_entry_with_etag(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(cache, "_enabled", True)
+    responses = [_FakeGetResponse(200, {"seats_purchased": 4}, etag='"v1"'), _FakeGetResponse(304, {})]
+    sent_headers: list = []
+
+    class _Session:
+        def get(self, url: str, headers: dict, timeout: tuple) -> _FakeGetResponse:
+            sent_headers.append(headers.get("If-None-Match"))
+            return responses.pop(0)
+
+    monkeypatch.setattr(github_monitor, "_session", lambda: _Session())
+    # Bypass the response TTL cache so the second call goes to the (fake) API
+    fetch = github_monitor.get_copilot_org.__wrapped__
+
+    assert fetch("acme") == {"seats_purchased": 4}
+    assert fetch("acme") == {"seats_purchased": 4}
+    assert sent_headers == [None, '"v1"']
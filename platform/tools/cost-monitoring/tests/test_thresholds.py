@@ -0,0 +1,55 @@
+from cost_monitoring.alerting.thresholds import evaluate_all_thresholds, group_alerts_by_severity
+
+THRESHOLDS = {
+    "github": {"copilot": {"total_monthly_usd": 100, "seats": {"max": 5}}},
+    "gcp": {
+        "defaults": {"total_monthly_usd": 100, "per_service_monthly_usd": {"BigQuery": 10}},
+        "projects": {"big-project": {"total_monthly_usd": 1000}},
+    },
+}
+
+
+def test_evaluate_all_thresholds_orders_by_severity_and_counts() -> None:
+    github_data = {"copilot": {"monthly_cost_usd": 120, "seats_assigned": 6}}
+    gcp_data = {
+        "project_costs": [
+            {
+                "project_id": "small-project",
+                "total_net_usd": 200,
+                "services": [{"service": "BigQuery", "net_cost_usd": 20}, {"service": "Cloud Run", "net_cost_usd": 5}],
+            },
+            {"project_id": "big-project", "total_net_usd": 500, "services": []},
+        ]
+    }
+
+    result = evaluate_all_thresholds(github_data, gcp_data, THRESHOLDS)
+
+    assert [(a["scope"], a["type"], a["severity"]) for a in result["alerts"]] == [
+        ("gcp", "total_usd", "high"),
+        ("github", "total_usd", "medium"),
+        ("github", "seats", "medium"),
+        ("gcp", "service", "medium"),
+    ]
+    assert result["threshold_exceeded"] is True
+    assert (result["github_alerts_count"], result["gcp_alerts_count"]) == (2, 2)
+    assert (result["critical_count"], result["high_count"], result["medium_count"]) == (0, 1, 3)
+
+
+def test_evaluate_all_thresholds_without_alerts() -> None:
+    result = evaluate_all_thresholds({"copilot": {"monthly_cost_usd": 1}}, {"project_costs": []}, THRESHOLDS)
+
+    assert result["alerts"] == []
+    assert result["threshold_exceeded"] is False
+
+
+def test_group_alerts_by_severity_buckets_unknown_as_low() -> None:
+    alerts = [{"id": 1, "severity": "medium"}, {"id": 2}, {"id": 3, "severity": "high"}, {"id": 4, "severity": "odd"}]
+
+    buckets = group_alerts_by_severity(alerts)
+
+    assert {severity: [a["id"] for a in items] for severity, items in buckets.items()} == {
+        "critical": [],
+        "high": [3],
+        "medium": [1],
+        "low": [2, 4],
+    }
@@ -0,0 +1,51 @@
+import json
+
+from cost_monitoring.report.writers import write_all_reports
+
+
+def _sample_data() -> dict:
+    return {
+        "github": {
+            "copilot": {"seats_assigned": 3, "seats_purchased": 4, "monthly_cost_usd": 76.0, "price_per_seat": 19.0},
+            "enterprise_cloud": {"seats": 0, "monthly_cost_usd": 0.0, "price_per_seat": 0.0},
+            "org_members": [{"org": "acme", "members": 5}],
+            "total_monthly_cost_usd": 76.0,
+        },
+        "gcp": {
+            "projects_monitored": 1,
+            "project_costs": [
+                {
+                    "project_id": "proj-a",
+                    "services": [{"service": "BigQuery", "cost_usd": 10.0, "credits_usd": 1.0, "net_cost_usd": 9.0}],
+                    "total_cost_usd": 10.0,
+                    "total_credits_usd": 1.0,
+                    "total_net_usd": 9.0,
+                }
+            ],
+            "total_cost_usd": 10.0,
+            "total_credits_usd": 1.0,
+            "total_net_usd": 9.0,
+        },
+        "alerts": [],
+    }
+
+
+def test_write_all_reports_writes_every_format_by_default(tmp_path) -> None:
+    paths = write_all_reports(str(tmp_path), _sample_data(), "2026-03")
+
+    assert set(paths) == {"csv", "markdown", "json"}
+    assert paths["csv"].endswith("costs_report_2026_03.csv")
+    csv_lines = (tmp_path / "costs_report_2026_03.csv").read_text(encoding="utf-8").splitlines()
+    assert csv_lines[0] == "source,scope,project,service,metric,value,currency,month"
+    assert "gcp,service,proj-a,BigQuery,net_cost,9.0,USD,2026-03" in csv_lines
+    assert "# Cost Report 2026-03" in (tmp_path / "costs_report_2026_03.md").read_text(encoding="utf-8")
+    report = json.loads((tmp_path / "costs_report_2026_03.json").read_text(encoding="utf-8"))
+    assert report["month"] == "2026-03"
+    assert "generated_at" in report
+
+
+def test_write_all_reports_honors_requested_formats(tmp_path) -> None:
+    paths = write_all_reports(str(tmp_path), _sample_data(), "2026-03", formats=["md", " ", "pdf"])
+
+    assert list(paths) == ["markdown"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["costs_report_2026_03.md"]
@@ -3,11 +3,12 @@
 Auto-fix bot configuration issues.
 """
 
-import json
 import argparse
 import subprocess
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+from auto_fix_common import encode_templates, git_add, load_report
 
 
 # Template bot configurations
@@ -116,37 +117,33 @@ security_scanning:
 """
 }
 
+_BOT_CONFIG_BYTES = encode_templates(BOT_CONFIG_TEMPLATES)
+
 
 def parse_bot_config_report(report_file: str) -> Dict[str, Any]:
     """Parse bot configuration audit report."""
-    with open(report_file, "r") as f:
-        report = json.load(f)
-    
-    issues = {
-        "missing_configs": [],
-        "invalid_configs": report.get("invalid_configs", []),
-        "warnings": report.get("warnings", [])
-    }
+    report = load_report(report_file)
     
     # Check which configs are missing
     expected_configs = ["legacy-agent-rules.md", "legacy-agentbot.json", "copilot-config.yml"]
-    found_configs = []
+    found_configs = set()
     
     for detail in report.get("details", []):
         config_file = Path(detail.get("file", "")).name
         if config_file:
-            found_configs.append(config_file)
+            found_configs.add(config_file)
     
-    for expected in expected_configs:
-        if expected not in found_configs:
-            issues["missing_configs"].append(expected)
-    
-    return issues
+    return {
+        "missing_configs": [e for e in expected_configs if e not in found_configs],
+        "invalid_configs": report.get("invalid_configs", []),
+        "warnings": report.get("warnings", [])
+    }
 
 
 def fix_bot_configs(issues: Dict[str, Any], branch: str, dry_run: bool = False) -> int:
     """Fix bot configuration issues."""
     fixed_count = 0
+    staged: List[str] = []
     
     # Create bot-configs directory if it doesn't exist
     bot_configs_dir = Path("bot-configs")
@@ -158,12 +155,8 @@ def fix_bot_configs(issues: Dict[str, Any], branch: str, dry_run: bool = False)
             config_path = bot_configs_dir / config_name
             print(f"Creating missing config: {config_name}")
             
-            with open(config_path, "w") as f:
-                f.write(BOT_CONFIG_TEMPLATES[config_name])
-            
-            if not dry_run:
-                subprocess.run(["git", "add", str(config_path)], check=True)
-            
+            config_path.write_bytes(_BOT_CONFIG_BYTES[config_name])
+            staged.append(str(config_path))
             fixed_count += 1
     
     # Fix invalid configurations by replacing with templates
@@ -175,14 +168,14 @@ def fix_bot_configs(issues: Dict[str, Any], branch: str, dry_run: bool = False)
             config_path = bot_configs_dir / config_filename
             print(f"Replacing invalid config: {config_filename}")
             
-            with open(config_path, "w") as f:
-                f.write(BOT_CONFIG_TEMPLATES[config_filename])
-            
-            if not dry_run:
-                subprocess.run(["git", "add", str(config_path)], check=True)
-            
+            config_path.write_bytes(_BOT_CONFIG_BYTES[config_filename])
+            staged.append(str(config_path))
             fixed_count += 1
     
+    # Stage everything in one git invocation
+    if staged and not dry_run:
+        git_add(staged)
+    
     return fixed_count
 
 
@@ -0,0 +1,28 @@
+"""
+Helpers shared by the audit auto-fix scripts.
+"""
+
+import json
+import subprocess
+from typing import Any, Dict, List
+
+# Paths per `git add` invocation; keeps the command line well under ARG_MAX
+GIT_ADD_BATCH = 1000
+
+
+def encode_templates(templates: Dict[str, str]) -> Dict[str, bytes]:
+    """Encode static templates once so writes skip the text-mode encoder."""
+    return {name: template.encode("utf-8") for name, template in templates.items()}
+
+
+def git_add(paths: List[str]) -> None:
+    """Stage paths with as few `git add` processes as possible."""
+    unique = list(dict.fromkeys(paths))
+    for start in range(0, len(unique), GIT_ADD_BATCH):
+        subprocess.run(["git", "add", "--", *unique[start:start + GIT_ADD_BATCH]], check=True)
+
+
+def load_report(report_file: str) -> Dict[str, Any]:
+    """Load an audit report JSON file."""
+    with open(report_file, "r") as f:
+        return json.load(f)
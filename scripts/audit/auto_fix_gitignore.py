@@ -3,12 +3,13 @@
 Auto-fix gitignore compliance issues.
 """
 
-import json
 import argparse
 import subprocess
 from pathlib import Path
 from typing import List, Dict, Any
 
+from auto_fix_common import encode_templates, git_add, load_report
+
 
 # Template gitignore patterns for different project types
 GITIGNORE_TEMPLATES = {
@@ -149,11 +150,12 @@ Thumbs.db
 """
 }
 
+_GITIGNORE_BYTES = encode_templates(GITIGNORE_TEMPLATES)
+
 
 def get_missing_patterns_from_report(report_file: str) -> Dict[str, List[str]]:
     """Extract missing patterns from audit report."""
-    with open(report_file, "r") as f:
-        report = json.load(f)
+    report = load_report(report_file)
     
     repos_to_fix = {}
     
@@ -184,27 +186,28 @@ def fix_gitignore(repo_path: str, info: Dict[str, Any]) -> bool:
     if not info.get("has_gitignore"):
         # Create new gitignore from template
         print(f"  Creating new .gitignore for {project_type} project")
-        with open(gitignore_path, "w") as f:
-            f.write(GITIGNORE_TEMPLATES.get(project_type, GITIGNORE_TEMPLATES["backend"]))
+        gitignore_path.write_bytes(_GITIGNORE_BYTES.get(project_type, _GITIGNORE_BYTES["backend"]))
         return True
     
     # Append missing patterns
-    missing_patterns = info.get("missing_patterns", [])
+    # Sub-checks often report the same pattern more than once; keep first-seen
+    # order so the appended block diffs cleanly. Negation patterns are skipped.
+    missing_patterns = [
+        pattern
+        for pattern in dict.fromkeys(info.get("missing_patterns", []))
+        if not pattern.startswith("!")
+    ]
     if missing_patterns:
         print(f"  Adding {len(missing_patterns)} missing patterns")
         
-        # Read existing content
-        with open(gitignore_path, "r") as f:
-            existing_content = f.read()
-        
-        # Append missing patterns
-        with open(gitignore_path, "a") as f:
-            if not existing_content.endswith("\n"):
-                f.write("\n")
-            f.write("\n# Added by security audit auto-fix\n")
-            for pattern in missing_patterns:
-                if not pattern.startswith("!"):  # Skip negation patterns
-                    f.write(f"{pattern}\n")
+        # Read once, append in memory, write once
+        existing_content = gitignore_path.read_bytes()
+        parts = [existing_content]
+        if not existing_content.endswith(b"\n"):
+            parts.append(b"\n")
+        parts.append(b"\n# Added by security audit auto-fix\n")
+        parts.extend(f"{pattern}\n".encode("utf-8") for pattern in missing_patterns)
+        gitignore_path.write_bytes(b"".join(parts))
         return True
     
     return False
@@ -236,6 +239,7 @@ def main():
             subprocess.run(["git", "checkout", args.branch], check=True, capture_output=True)
     
     fixed_count = 0
+    staged: List[str] = []
     
     for repo, info in repos_to_fix.items():
         print(f"\nProcessing {repo}...")
@@ -254,11 +258,11 @@ def main():
             fixed_count += 1
             
             # The .gitignore file is created at repo_dir/.gitignore
-            gitignore_path = repo_dir / ".gitignore"
-            
-            if not args.dry_run:
-                # Stage changes
-                subprocess.run(["git", "add", str(gitignore_path)], check=True)
+            staged.append(str(repo_dir / ".gitignore"))
+    
+    # Stage changes in one git invocation
+    if staged and not args.dry_run:
+        git_add(staged)
     
     if fixed_count > 0 and not args.dry_run:
         # Commit changes